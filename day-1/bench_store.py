@@ -0,0 +1,57 @@
+"""Compare BookStore against the old list-scan update/delete.
+
+    python bench_store.py --books 1000000 --ops 1000
+"""
+import argparse
+import random
+import time
+
+from books import Book
+from store import BookStore
+
+
+def list_update(books, book_id):
+    for x in books:
+        if x.id == book_id:
+            x.title = "The Great Gatsby"
+            return x
+
+
+def list_delete(books, book_id):
+    for x in books:
+        if x.id == book_id:
+            books.remove(x)
+            return x
+
+
+def timed(label, fn, ids):
+    start = time.perf_counter()
+    for book_id in ids:
+        fn(book_id)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {len(ids) / elapsed:>14,.0f} ops/s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    records = [Book(id=i, title=f"Book {i}", author=f"Author {i % 1000}", price=i % 100) for i in range(args.books)]
+    ids = random.sample(range(args.books), args.ops)
+
+    as_list = list(records)
+    store = BookStore()
+    for book in records:
+        store.add(book)
+
+    print(f"{args.books:,} books, {args.ops:,} operations each")
+    timed("list scan update", lambda i: list_update(as_list, i), ids)
+    timed("BookStore update", lambda i: store.update(i, title="The Great Gatsby"), ids)
+    timed("list scan delete", lambda i: list_delete(as_list, i), ids)
+    timed("BookStore delete", store.delete, ids)
+
+
+if __name__ == "__main__":
+    main()
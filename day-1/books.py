@@ -1,46 +1,74 @@
-from fastapi import FastAPI, HTTPException
+import math
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
+from store import BookStore
 
 
 app = FastAPI()
 
+@app.exception_handler(RequestValidationError)
+async def validation_error(request: Request, exc: RequestValidationError):
+    # The default handler echoes the rejected input, and a JSON body with
+    # "price": Infinity parses to a float that cannot be encoded back to JSON
+    errors = [
+        {**error, "input": str(error["input"])}
+        if isinstance(error.get("input"), float) and not math.isfinite(error["input"]) else error
+        for error in exc.errors()
+    ]
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
 class Book(BaseModel):
     id: int = Field(default=1)
     title: str = Field(default="The Great Gatsby")
     author: str = Field(default="F. Scott Fitzgerald")
-    price: float = Field(default=10.99)
+    price: float = Field(default=10.99, allow_inf_nan=False)
 
-books = []
+books = BookStore()
 
 @app.post("/")
 def create_book(book: Book):
-    books.append(book)
-    return book
+    try:
+        return books.add(book)
+    except KeyError:
+        raise HTTPException(status_code=400, detail="Book already exists")
 
 @app.get("/")
-def get_books():
-    return books
+def get_books(
+    author: str | None = None,
+    min_price: float | None = Query(default=None, allow_inf_nan=False),
+    max_price: float | None = Query(default=None, allow_inf_nan=False),
+):
+    if author is not None:
+        result = books.by_author(author)
+        if min_price is not None:
+            result = [x for x in result if x.price >= min_price]
+        if max_price is not None:
+            result = [x for x in result if x.price <= max_price]
+        return result
+    if min_price is not None or max_price is not None:
+        return books.by_price(min_price, max_price)
+    return books.all()
 
 @app.get("/{book_id}")
 def get_book(book_id: int):
-    return books[book_id]
+    book = books.get(book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return book
 
 @app.put("/{book_id}")
 def update_book(book_id: int):
-    for x in books:
-        if x.id == book_id:
-            x.title = "The Great Gatsby"
-            x.author = "F. Scott Fitzgerald"
-            x.price = 10.99
-            return x
-    raise HTTPException(status_code=404, detail="Book not found")
+    book = books.update(book_id, title="The Great Gatsby", author="F. Scott Fitzgerald", price=10.99)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return book
 
 @app.delete("/{book_id}")
 def delete_book(book_id: int):
-    for x in books:
-        if x.id == book_id:
-            books.remove(x)
-            return books
-    raise HTTPException(status_code=404, detail="Book not found")
-    return books
-
+    book = books.delete(book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return book
@@ -0,0 +1,109 @@
+import threading
+from collections import defaultdict
+
+
+class BookStore:
+    """In-memory book repository with an id index plus author and price indexes.
+
+    Records are never mutated in place: updates swap in a new model, so a handler
+    that already holds a book keeps a consistent snapshot. All writes go through
+    one lock because FastAPI runs sync handlers on a threadpool.
+    """
+
+    def __init__(self, price_bucket: float = 10.0):
+        self._lock = threading.RLock()
+        self._by_id = {}
+        self._by_author = defaultdict(set)
+        self._by_price = defaultdict(set)
+        self._price_bucket = price_bucket
+
+    def _bucket(self, price: float) -> int:
+        return int(price // self._price_bucket)
+
+    def _index(self, book, bucket: int):
+        # bucket is computed by the caller before any index is touched, so a
+        # price that cannot be bucketed never leaves a half-indexed record
+        self._by_author[book.author].add(book.id)
+        self._by_price[bucket].add(book.id)
+
+    def _unindex(self, book):
+        ids = self._by_author[book.author]
+        ids.discard(book.id)
+        if not ids:
+            del self._by_author[book.author]
+        ids = self._by_price[self._bucket(book.price)]
+        ids.discard(book.id)
+        if not ids:
+            del self._by_price[self._bucket(book.price)]
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, book_id: int):
+        return book_id in self._by_id
+
+    def add(self, book):
+        with self._lock:
+            if book.id in self._by_id:
+                raise KeyError(book.id)
+            bucket = self._bucket(book.price)
+            self._by_id[book.id] = book
+            self._index(book, bucket)
+            return book
+
+    def get(self, book_id: int):
+        return self._by_id.get(book_id)
+
+    def update(self, book_id: int, **fields):
+        with self._lock:
+            old = self._by_id.get(book_id)
+            if old is None:
+                return None
+            new = old.model_copy(update=fields)
+            bucket = self._bucket(new.price)
+            self._unindex(old)
+            self._by_id[book_id] = new
+            self._index(new, bucket)
+            return new
+
+    def delete(self, book_id: int):
+        with self._lock:
+            book = self._by_id.pop(book_id, None)
+            if book is not None:
+                self._unindex(book)
+            return book
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._by_author.clear()
+            self._by_price.clear()
+
+    def all(self) -> list:
+        with self._lock:
+            return list(self._by_id.values())
+
+    def by_author(self, author: str) -> list:
+        with self._lock:
+            return [self._by_id[i] for i in self._by_author.get(author, ())]
+
+    def by_price(self, min_price: float | None = None, max_price: float | None = None) -> list:
+        with self._lock:
+            if not self._by_price:
+                return []
+            lo = self._bucket(min_price) if min_price is not None else min(self._by_price)
+            hi = self._bucket(max_price) if max_price is not None else max(self._by_price)
+            if hi - lo < len(self._by_price):
+                buckets = range(lo, hi + 1)
+            else:
+                buckets = [b for b in self._by_price if lo <= b <= hi]
+            result = []
+            for bucket in buckets:
+                for book_id in self._by_price.get(bucket, ()):
+                    book = self._by_id[book_id]
+                    if min_price is not None and book.price < min_price:
+                        continue
+                    if max_price is not None and book.price > max_price:
+                        continue
+                    result.append(book)
+            return result
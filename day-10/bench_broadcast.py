@@ -0,0 +1,119 @@
+"""Broadcast load test with simulated WebSocket clients, no server needed.
+
+Most clients receive instantly, --slow of them take --slow-ms per send and
+--dead of them raise like a dropped connection. Compares the old sequential
+broadcast with ConnectionManager under each slow-consumer policy.
+
+    python bench_broadcast.py --clients 10000 --messages 50 --slow 100 --dead 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from connections import SLOW_CONSUMER_POLICIES, ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0, dead=False):
+        self.delay = delay
+        self.dead = dead
+        self.received = []
+        self.closed = None
+
+    async def accept(self):
+        pass
+
+    async def send(self, message):
+        if self.dead:
+            raise RuntimeError("Cannot call send once a close message has been sent")
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append((time.perf_counter(), message))
+
+    async def send_text(self, text):
+        await self.send({"type": "websocket.send", "text": text})
+
+    async def close(self, code=1000):
+        self.closed = code
+
+
+def make_clients(args):
+    sockets = [FakeWebSocket() for _ in range(args.clients - args.slow - args.dead)]
+    sockets += [FakeWebSocket(delay=args.slow_ms / 1000) for _ in range(args.slow)]
+    sockets += [FakeWebSocket(dead=True) for _ in range(args.dead)]
+    return sockets
+
+
+async def old_broadcast(connections, message):
+    # What main.py did before: one await per client, in order
+    for connection in connections:
+        await connection.send_text(message)
+
+
+async def bench_old(args):
+    sockets = make_clients(args)
+    # Dead clients first would abort every broadcast immediately; put them last
+    start = time.perf_counter()
+    try:
+        await old_broadcast(sockets, "message 0")
+        outcome = "ok"
+    except RuntimeError:
+        outcome = "raised on a dead client"
+    elapsed = time.perf_counter() - start
+    reached = sum(1 for s in sockets if s.received)
+    print(f"old sequential    1 broadcast took {elapsed * 1000:9.1f} ms, {outcome}, reached {reached:,}/{len(sockets):,}")
+
+
+async def bench_manager(args, policy):
+    manager = ConnectionManager(max_queue=args.queue, slow_consumer=policy, send_timeout=args.send_timeout)
+    sockets = make_clients(args)
+    for i, socket in enumerate(sockets):
+        await manager.connect(socket, f"client-{i}")
+
+    call_times, sent_at = [], {}
+    for n in range(args.messages):
+        message = f"message {n}"
+        start = time.perf_counter()
+        manager.broadcast(message)
+        call_times.append(time.perf_counter() - start)
+        sent_at[message] = start
+        await asyncio.sleep(args.interval / 1000)
+    # Let the writers drain what they can
+    await asyncio.sleep(args.slow_ms / 1000 * 2)
+
+    fast = [s for s in sockets if not s.delay and not s.dead]
+    latencies = sorted(at - sent_at[m["text"]] for s in fast for at, m in s.received)
+    delivered = sum(len(s.received) for s in fast)
+    stats = manager.stats()
+    print(
+        f"{policy:<17} broadcast() p50 {statistics.median(call_times) * 1000:7.2f} ms  max {max(call_times) * 1000:7.2f} ms | "
+        f"fast clients got {delivered / (len(fast) * args.messages):6.1%}, delivery p50 {statistics.median(latencies) * 1000:7.1f} ms "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f} ms | clients left {stats['clients']:,}, "
+        f"dropped {stats['dropped']:,}, slow disconnects {stats['disconnected_slow']}"
+    )
+    for client_id in list(manager.clients):
+        manager.disconnect(client_id)
+    await asyncio.sleep(0)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=10, help="ms between broadcasts")
+    parser.add_argument("--slow", type=int, default=100)
+    parser.add_argument("--slow-ms", type=float, default=200)
+    parser.add_argument("--dead", type=int, default=10)
+    parser.add_argument("--queue", type=int, default=20)
+    parser.add_argument("--send-timeout", type=float, default=5)
+    args = parser.parse_args()
+
+    print(f"{args.clients:,} clients ({args.slow} slow at {args.slow_ms:.0f} ms/send, {args.dead} dead), {args.messages} broadcasts every {args.interval:.0f} ms, queue {args.queue}")
+    await bench_old(args)
+    for policy in SLOW_CONSUMER_POLICIES:
+        await bench_manager(args, policy)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,24 @@
+"""Local pub/sub broker for running several day-10 workers on one machine.
+
+    python broker.py --port 7001
+    WS_BACKEND=broker WS_BROKER=127.0.0.1:7001 uvicorn main:app --workers 4
+"""
+import argparse
+import asyncio
+
+from pubsub import Broker
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7001)
+    args = parser.parse_args()
+
+    server = await Broker().serve(args.host, args.port)
+    print(f"broker listening on {args.host}:{server.sockets[0].getsockname()[1]}")
+    await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
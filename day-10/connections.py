@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+import os
+from fastapi import WebSocket
+from pubsub import MemoryBackend, backend_from_env
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "drop_newest", "disconnect")
+
+DEFAULT_ROOM = "lobby"
+
+class Client:
+    def __init__(self, client_id: str, websocket: WebSocket, max_queue: int, room: str = DEFAULT_ROOM):
+        self.client_id = client_id
+        self.websocket = websocket
+        self.room = room
+        self.queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=max_queue)
+        self.writer: asyncio.Task | None = None
+        self.dropped = 0
+
+class ConnectionManager:
+    """WebSocket connections keyed by client_id, each with its own writer task.
+
+    Sending only enqueues: every client has a bounded queue drained by a
+    writer task, so a slow or dead client never holds up anyone else. When a
+    queue is full `slow_consumer` decides what happens: drop the client's
+    oldest queued message, drop the new one, or disconnect the client. A send
+    that takes longer than `send_timeout` seconds disconnects the client.
+
+    broadcast() reaches this process only. publish() goes through the pub/sub
+    `backend`, which hands every message to deliver() on every worker, so
+    clients connected to different workers see each other's messages.
+    """
+
+    def __init__(self, max_queue: int = 100, slow_consumer: str = "drop_oldest", send_timeout: float = 5, backend=None):
+        if slow_consumer not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {slow_consumer}")
+        self.max_queue = max_queue
+        self.slow_consumer = slow_consumer
+        self.send_timeout = send_timeout
+        self.backend = backend or MemoryBackend()
+        self.clients: dict[str, Client] = {}
+        self.rooms: dict[str, dict[str, Client]] = {}
+        self.dropped = 0
+        self.disconnected_slow = 0
+        self._closing: set[asyncio.Task] = set()
+
+    async def start(self):
+        await self.backend.start(self.deliver)
+
+    async def stop(self):
+        await self.backend.stop()
+
+    async def connect(self, websocket: WebSocket, client_id: str, room: str = DEFAULT_ROOM):
+        await websocket.accept()
+        previous = self.clients.get(client_id)
+        if previous is not None:
+            # Same id connecting again (e.g. a page reload): the newest socket wins
+            self._remove(previous, close_code=1000)
+        client = Client(client_id, websocket, self.max_queue, room)
+        client.writer = asyncio.create_task(self._write(client))
+        self.clients[client_id] = client
+        self.rooms.setdefault(room, {})[client_id] = client
+
+    def disconnect(self, client_id: str, websocket: WebSocket | None = None) -> bool:
+        # Passing the websocket keeps a stale handler from removing a newer connection
+        client = self.clients.get(client_id)
+        if client is None or (websocket is not None and client.websocket is not websocket):
+            return False
+        self._remove(client)
+        return True
+
+    def _remove(self, client: Client, close_code: int | None = None):
+        if self.clients.get(client.client_id) is client:
+            del self.clients[client.client_id]
+            members = self.rooms[client.room]
+            del members[client.client_id]
+            if not members:
+                del self.rooms[client.room]
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        if close_code is not None:
+            task = asyncio.create_task(self._close(client.websocket, close_code))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    async def _close(self, websocket: WebSocket, code: int):
+        with contextlib.suppress(Exception):
+            await websocket.close(code=code)
+
+    async def _write(self, client: Client):
+        try:
+            while True:
+                message = await client.queue.get()
+                await asyncio.wait_for(client.websocket.send(message), self.send_timeout)
+        except asyncio.TimeoutError:
+            self.disconnected_slow += 1
+            self._remove(client, close_code=1008)
+        except Exception:
+            # The socket is gone; the endpoint's receive loop sees the disconnect
+            self._remove(client)
+
+    def _enqueue(self, client: Client, message: dict) -> bool:
+        try:
+            client.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            pass
+        client.dropped += 1
+        self.dropped += 1
+        if self.slow_consumer == "drop_oldest":
+            client.queue.get_nowait()
+            client.queue.put_nowait(message)
+            return True
+        if self.slow_consumer == "disconnect":
+            self.disconnected_slow += 1
+            self._remove(client, close_code=1008)
+        return False
+
+    # ASGI send events are built once and the same object is queued for every
+    # client, so a broadcast encodes its payload once whatever the audience size
+    @staticmethod
+    def _event(message: str | bytes) -> dict:
+        if isinstance(message, bytes):
+            return {"type": "websocket.send", "bytes": message}
+        return {"type": "websocket.send", "text": message}
+
+    def send_personal_message(self, message: str | bytes, client_id: str) -> bool:
+        client = self.clients.get(client_id)
+        return client is not None and self._enqueue(client, self._event(message))
+
+    def broadcast(self, message: str | bytes, room: str | None = None) -> int:
+        # Local clients only, in `room` or everywhere; see publish() for all workers
+        event = self._event(message)
+        members = self.clients if room is None else self.rooms.get(room, {})
+        # list() because the disconnect policy can remove clients mid-loop
+        return sum(self._enqueue(client, event) for client in list(members.values()))
+
+    async def publish(self, message: str, room: str = DEFAULT_ROOM):
+        await self.backend.publish(room, message.encode())
+
+    def deliver(self, room: str, message: bytes):
+        self.broadcast(message.decode(), room)
+
+    def stats(self) -> dict:
+        return {
+            "clients": len(self.clients),
+            "rooms": len(self.rooms),
+            "backend": type(self.backend).__name__,
+            "backend_stats": self.backend.stats(),
+            "queued": sum(client.queue.qsize() for client in self.clients.values()),
+            "dropped": self.dropped,
+            "disconnected_slow": self.disconnected_slow,
+            "policy": self.slow_consumer,
+        }
+
+manager = ConnectionManager(
+    max_queue=int(os.getenv("WS_QUEUE_SIZE", "100")),
+    slow_consumer=os.getenv("WS_SLOW_CONSUMER", "drop_oldest"),
+    send_timeout=float(os.getenv("WS_SEND_TIMEOUT", "5")),
+    backend=backend_from_env(),
+)
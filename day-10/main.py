@@ -1,7 +1,19 @@
+import logging
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse
-import asyncio
-app = FastAPI()
+from contextlib import asynccontextmanager
+from connections import DEFAULT_ROOM, manager
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pub/sub subscription per worker; messages fan out to local clients
+    await manager.start()
+    yield
+    await manager.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 html = """
 <!DOCTYPE html>
@@ -135,26 +147,6 @@ html = """
 </html>
 """
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
-
-manager = ConnectionManager()
-
 @app.get("/")
 async def get():
     return HTMLResponse(html)
@@ -165,14 +157,40 @@ async def submit(request: Request):
     text = payload.get("text")
     return {"received": text}
 
+@app.get("/ws-metrics")
+async def ws_metrics():
+    return manager.stats()
+
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
-    await manager.connect(websocket)
+    await chat(websocket, client_id, DEFAULT_ROOM)
+
+@app.websocket("/ws/{room}/{client_id}")
+async def room_websocket_endpoint(websocket: WebSocket, room: str, client_id: str):
+    await chat(websocket, client_id, room)
+
+async def publish(message: str, room: str) -> bool:
+    # Redis or the broker may be down or reconnecting; that should cost one
+    # message, not the socket
+    try:
+        await manager.publish(message, room)
+        return True
+    except Exception:
+        logger.exception("Publishing to room %r failed", room)
+        return False
+
+async def chat(websocket: WebSocket, client_id: str, room: str):
+    await manager.connect(websocket, client_id, room)
     try:
         while True:
             data = await websocket.receive_text()
-            await manager.send_personal_message(f"You wrote: {data}", websocket)
-            await manager.broadcast(f"Client #{client_id} says: {data}")
+            # Personal messages are queued locally; room messages go through the
+            # pub/sub backend so clients on every worker get them
+            manager.send_personal_message(f"You wrote: {data}", client_id)
+            if not await publish(f"Client #{client_id} says: {data}", room):
+                manager.send_personal_message("Message not delivered, please try again", client_id)
     except WebSocketDisconnect:
-        manager.disconnect(websocket)
-        await manager.broadcast(f"Client #{client_id} disconnected")
+        pass
+    finally:
+        if manager.disconnect(client_id, websocket):
+            await publish(f"Client #{client_id} disconnected", room)
@@ -0,0 +1,204 @@
+import asyncio
+import contextlib
+import os
+import struct
+from typing import Awaitable, Callable
+
+# Called with (room, message) for every message published to any room
+Handler = Callable[[str, bytes], Awaitable[None] | None]
+
+class MemoryBackend:
+    """Single process: publish hands the message straight to the local handler."""
+
+    async def start(self, handler: Handler):
+        self.handler = handler
+
+    async def publish(self, room: str, message: bytes):
+        result = self.handler(room, message)
+        if asyncio.iscoroutine(result):
+            await result
+
+    async def stop(self):
+        pass
+
+    def stats(self) -> dict:
+        return {}
+
+class RedisBackend:
+    """Redis pub/sub, one channel per room.
+
+    Each worker holds a single pattern subscription to every room and fans out
+    to its own clients, so Redis sends a message once per worker, not once
+    per client. If the connection drops the listener resubscribes every
+    `retry_delay` seconds; messages published in the meantime are lost.
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "ws:", redis=None, retry_delay: float = 1):
+        self.url = url
+        self.prefix = prefix
+        self.redis = redis
+        self.retry_delay = retry_delay
+        self.failures = 0
+        self.last_error: str | None = None
+        self._listener: asyncio.Task | None = None
+
+    async def start(self, handler: Handler):
+        if self.redis is None:
+            from redis.asyncio import Redis
+            self.redis = Redis.from_url(self.url)
+        # Subscribed before start() returns, so an immediate publish is not missed
+        pubsub = await self._subscribe()
+        self._running = True
+        self._listener = asyncio.create_task(self._listen(pubsub, handler))
+
+    async def _subscribe(self):
+        pubsub = self.redis.pubsub()
+        await pubsub.psubscribe(f"{self.prefix}*")
+        return pubsub
+
+    async def _listen(self, pubsub, handler: Handler):
+        while self._running:
+            try:
+                if pubsub is None:
+                    pubsub = await self._subscribe()
+                # get_message with a timeout instead of listen(), which can sit on a
+                # read that swallows cancellation; stop() clears _running instead
+                while self._running:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.5)
+                    if message is not None and message["type"] == "pmessage":
+                        result = handler(message["channel"].decode()[len(self.prefix):], message["data"])
+                        if asyncio.iscoroutine(result):
+                            await result
+            except Exception as e:
+                # Redis restarted or the network dropped: resubscribe instead of
+                # leaving this worker deaf to every other worker
+                self.failures += 1
+                self.last_error = repr(e)
+            finally:
+                if pubsub is not None:
+                    with contextlib.suppress(Exception):
+                        await pubsub.aclose()
+                pubsub = None
+            if self._running:
+                await asyncio.sleep(self.retry_delay)
+
+    async def publish(self, room: str, message: bytes):
+        await self.redis.publish(f"{self.prefix}{room}", message)
+
+    async def stop(self):
+        self._running = False
+        if self._listener is not None:
+            await self._listener
+        await self.redis.aclose()
+
+    def stats(self) -> dict:
+        return {"failures": self.failures, "last_error": self.last_error}
+
+# Broker frames: 4-byte big-endian room length and message length, then the
+# room and the message. Both are length-prefixed because the room comes from
+# the URL and may contain any byte, NUL included
+def encode_frame(room: str, message: bytes) -> bytes:
+    room_bytes = room.encode()
+    return struct.pack(">II", len(room_bytes), len(message)) + room_bytes + message
+
+async def read_frame(reader: asyncio.StreamReader) -> tuple[str, bytes]:
+    room_length, message_length = struct.unpack(">II", await reader.readexactly(8))
+    body = await reader.readexactly(room_length + message_length)
+    return body[:room_length].decode(), body[room_length:]
+
+class Broker:
+    """Minimal local broker: every frame a worker sends is relayed to all connected workers.
+
+    A stand-in for Redis when running several workers on one machine (or in
+    tests). Run it with `python broker.py`.
+    """
+
+    def __init__(self):
+        self.writers: set[asyncio.StreamWriter] = set()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.writers.add(writer)
+        try:
+            while True:
+                frame = encode_frame(*await read_frame(reader))
+                for peer in list(self.writers):
+                    peer.write(frame)
+                # Wait for slow peers after writing to everyone, not one by one
+                await asyncio.gather(*(peer.drain() for peer in list(self.writers)), return_exceptions=True)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 7001) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self.handle, host, port)
+
+class BrokerBackend:
+    """Connects a worker to a Broker over TCP; the broker echoes every publish back to all workers.
+
+    If the broker goes away the listener reconnects every `retry_delay`
+    seconds. Until it is back, publish() raises ConnectionError.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 7001, retry_delay: float = 1):
+        self.host = host
+        self.port = port
+        self.retry_delay = retry_delay
+        self.failures = 0
+        self.last_error: str | None = None
+        self.writer: asyncio.StreamWriter | None = None
+        self._listener: asyncio.Task | None = None
+
+    async def start(self, handler: Handler):
+        await self._connect()
+        self._listener = asyncio.create_task(self._listen(handler))
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def _listen(self, handler: Handler):
+        while True:
+            try:
+                if self.writer is None:
+                    await self._connect()
+                while True:
+                    result = handler(*await read_frame(self.reader))
+                    if asyncio.iscoroutine(result):
+                        await result
+            except Exception as e:
+                self.failures += 1
+                self.last_error = repr(e)
+                if self.writer is not None:
+                    self.writer.close()
+                    self.writer = None
+                await asyncio.sleep(self.retry_delay)
+
+    async def publish(self, room: str, message: bytes):
+        if self.writer is None:
+            raise ConnectionError("Not connected to the broker")
+        self.writer.write(encode_frame(room, message))
+        await self.writer.drain()
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+        if self.writer is not None:
+            self.writer.close()
+
+    def stats(self) -> dict:
+        return {"connected": self.writer is not None, "failures": self.failures, "last_error": self.last_error}
+
+def backend_from_env():
+    # WS_BACKEND=memory (one process), redis (REDIS_URL) or broker (WS_BROKER=host:port)
+    kind = os.getenv("WS_BACKEND", "memory")
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "redis":
+        return RedisBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+    if kind == "broker":
+        host, _, port = os.getenv("WS_BROKER", "127.0.0.1:7001").rpartition(":")
+        return BrokerBackend(host, int(port))
+    raise RuntimeError(f"Unknown WS_BACKEND: {kind}")
@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing
+import fakeredis
+from fastapi.testclient import TestClient
+from connections import ConnectionManager
+from main import app, manager
+from pubsub import Broker, BrokerBackend, RedisBackend, encode_frame, read_frame
+
+class FakeWebSocket:
+    def __init__(self):
+        self.received = []
+
+    async def accept(self):
+        pass
+
+    async def send(self, message):
+        self.received.append(message["text"])
+
+    async def close(self, code=1000):
+        pass
+
+async def wait_for(condition, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return True
+        await asyncio.sleep(0.01)
+    return False
+
+def test_rooms_are_isolated():
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/a") as a, client.websocket_connect("/ws/b") as b, client.websocket_connect("/ws/other/z") as z:
+            z.send_text("hidden")
+            assert z.receive_text() == "You wrote: hidden"
+            assert z.receive_text() == "Client #z says: hidden"
+            a.send_text("hi")
+            assert a.receive_text() == "You wrote: hi"
+            assert a.receive_text() == "Client #a says: hi"
+            assert b.receive_text() == "Client #a says: hi"
+
+def test_publish_failure_keeps_socket_and_cleans_up(monkeypatch):
+    async def down(room, message):
+        raise ConnectionError("backend down")
+    with TestClient(app) as client:
+        monkeypatch.setattr(manager.backend, "publish", down)
+        with client.websocket_connect("/ws/a") as a:
+            a.send_text("hi")
+            assert a.receive_text() == "You wrote: hi"
+            assert a.receive_text() == "Message not delivered, please try again"
+            a.send_text("still here")
+            assert a.receive_text() == "You wrote: still here"
+        assert asyncio.run(wait_for(lambda: "a" not in manager.clients))
+
+def test_redis_backend_reaches_every_worker():
+    async def run():
+        server = fakeredis.FakeServer()
+        workers = [ConnectionManager(backend=RedisBackend(redis=fakeredis.FakeAsyncRedis(server=server))) for _ in range(2)]
+        sockets = []
+        for i, worker in enumerate(workers):
+            await worker.start()
+            sockets.append(FakeWebSocket())
+            await worker.connect(sockets[-1], f"client-{i}", "room")
+        await workers[0].publish("hello", "room")
+        await workers[0].publish("elsewhere", "other")
+        delivered = await wait_for(lambda: all(s.received for s in sockets))
+        for worker in workers:
+            await worker.stop()
+        return delivered, [s.received for s in sockets]
+    delivered, received = asyncio.run(run())
+    assert delivered
+    assert received == [["hello"], ["hello"]]
+
+def test_broker_frame_keeps_nul_in_room():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(encode_frame("a\0b", b"x\0y"))
+        return await read_frame(reader)
+    assert asyncio.run(run()) == ("a\0b", b"x\0y")
+
+def run_worker(port, worker_id, clients, barrier, results):
+    async def main():
+        manager = ConnectionManager(backend=BrokerBackend("127.0.0.1", port))
+        await manager.start()
+        sockets = [FakeWebSocket() for _ in range(clients)]
+        for i, socket in enumerate(sockets):
+            await manager.connect(socket, f"{worker_id}-{i}", "room")
+        await asyncio.get_running_loop().run_in_executor(None, barrier.wait)
+        if worker_id == 0:
+            await manager.publish("hello from worker 0", "room")
+        await wait_for(lambda: all(s.received for s in sockets))
+        results.put((worker_id, sum(s.received == ["hello from worker 0"] for s in sockets)))
+        await manager.stop()
+    asyncio.run(main())
+
+def test_broker_fans_out_across_processes():
+    async def run():
+        server = await Broker().serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        context = multiprocessing.get_context("spawn")
+        barrier, results = context.Barrier(3), context.Queue()
+        processes = [context.Process(target=run_worker, args=(port, i, 5, barrier, results)) for i in range(3)]
+        for process in processes:
+            process.start()
+        loop = asyncio.get_running_loop()
+        counts = dict([await loop.run_in_executor(None, results.get, True, 30) for _ in processes])
+        for process in processes:
+            await loop.run_in_executor(None, process.join, 10)
+        server.close()
+        return counts
+    assert asyncio.run(run()) == {0: 5, 1: 5, 2: 5}
+
+def test_backends_reconnect_after_connection_loss():
+    async def run():
+        redis_server = fakeredis.FakeServer()
+        redis_worker = ConnectionManager(backend=RedisBackend(redis=fakeredis.FakeAsyncRedis(server=redis_server), retry_delay=0.05))
+        broker = Broker()
+        server = await broker.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        broker_worker = ConnectionManager(backend=BrokerBackend("127.0.0.1", port, retry_delay=0.05))
+        sockets = []
+        for worker in (redis_worker, broker_worker):
+            await worker.start()
+            sockets.append(FakeWebSocket())
+            await worker.connect(sockets[-1], "client", "room")
+
+        # Drop both connections, then bring the servers back
+        redis_server.connected = False
+        server.close()
+        for writer in list(broker.writers):
+            writer.close()
+        await wait_for(lambda: redis_worker.backend.failures and broker_worker.backend.failures)
+        redis_server.connected = True
+        server = await broker.serve("127.0.0.1", port)
+        await wait_for(lambda: broker_worker.backend.writer is not None)
+        await asyncio.sleep(0.2)
+
+        for worker in (redis_worker, broker_worker):
+            await worker.publish("after reconnect", "room")
+        delivered = await wait_for(lambda: all(s.received for s in sockets))
+        stats = [worker.stats()["backend_stats"]["failures"] for worker in (redis_worker, broker_worker)]
+        for worker in (redis_worker, broker_worker):
+            await worker.stop()
+        server.close()
+        return delivered, [s.received for s in sockets], stats
+    delivered, received, failures = asyncio.run(run())
+    assert delivered
+    assert received == [["after reconnect"], ["after reconnect"]]
+    assert all(failures)
@@ -1,14 +1,15 @@
 from typing import Annotated
 from fastapi import FastAPI, Depends, BackgroundTasks
-from sqlalchemy import create_engine, MetaData, Table, Column, Integer, String
+from sqlalchemy import MetaData, Table, Column, Integer, String
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 import os
+from sqlite_engine import create_sqlite_engine
 
 app = FastAPI()
 
 DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_sqlite_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -0,0 +1,50 @@
+import os
+from sqlalchemy import create_engine, event, make_url
+
+# PRAGMAs applied to every new connection. "default" keeps SQLite's stock
+# behaviour (rollback journal, no busy timeout) for comparison.
+PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+# WAL lets readers run alongside the single writer, so keep enough pooled
+# connections for FastAPI's threadpool (40 threads by default).
+POOL_SETTINGS = {
+    "default": {},
+    "production": {"pool_size": 20, "max_overflow": 20, "pool_timeout": 30},
+}
+
+def is_file_database(url: str) -> bool:
+    # sqlite://, sqlite:///:memory: and shared-cache memory URIs use
+    # SingletonThreadPool/StaticPool, which reject the QueuePool settings
+    url = make_url(url)
+    return bool(url.database) and url.database != ":memory:" and url.query.get("mode") != "memory"
+
+def create_sqlite_engine(url: str, profile: str | None = None, **kwargs):
+    profile = profile or os.getenv("SQLITE_PROFILE", "production")
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    pragmas = PROFILES[profile]
+
+    connect_args = {"check_same_thread": False, **kwargs.pop("connect_args", {})}
+    if "busy_timeout" in pragmas:
+        connect_args.setdefault("timeout", pragmas["busy_timeout"] / 1000)
+    pool_settings = POOL_SETTINGS[profile] if is_file_database(url) else {}
+    engine = create_engine(url, connect_args=connect_args, **{**pool_settings, **kwargs})
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
@@ -0,0 +1,41 @@
+"""argon2 cost per profile, to pick ARGON2_PROFILE for a deployment.
+
+Reports hash/verify latency on one core and the login rate that implies,
+plus the old double-verify login path for comparison.
+
+    python bench_argon2.py --verifications 20
+"""
+import argparse
+import os
+import time
+
+from passwords import PROFILES, create_password_context
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--verifications", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'profile':<12} {'t':>3} {'m (MiB)':>8} {'p':>3} {'hash ms':>9} {'verify ms':>10} {'logins/s/core':>14} {'old (2x)/s':>11}")
+    for name, settings in PROFILES.items():
+        context = create_password_context(name)
+        hashed = context.hash("bench-password")
+        hash_s = timed(lambda: context.hash("bench-password"), max(1, args.verifications // 4))
+        verify_s = timed(lambda: context.verify_and_update("bench-password", hashed), args.verifications)
+        print(
+            f"{name:<12} {settings['rounds']:>3} {settings['memory_cost'] / 1024:>8.0f} {settings['parallelism']:>3} "
+            f"{hash_s * 1000:>9.1f} {verify_s * 1000:>10.1f} {1 / verify_s:>14.1f} {1 / (2 * verify_s):>11.1f}"
+        )
+    print(f"\n{os.cpu_count()} cpus; concurrent logins also need m x workers of memory")
+
+
+if __name__ == "__main__":
+    main()
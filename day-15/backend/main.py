@@ -1,14 +1,15 @@
 from fastapi import FastAPI, HTTPException, Depends, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from jose import JWTError
 from database import engine, SessionLocal
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from models import User
 from fastapi.middleware.cors import CORSMiddleware
-import secrets
+from passwords import create_password_context
+from tokens import TokenVerifier, load_keyring
+import os
 
 app = FastAPI()
 
@@ -33,13 +34,20 @@ def get_db():
     finally:
         db.close()
 
-#password hashing context
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+#password hashing context, argon2 cost set by ARGON2_PROFILE (see passwords.py)
+pwd_context = create_password_context()
 
 #JWT settings
-SECRET_KEY = secrets.token_urlsafe(32)
-print(SECRET_KEY)
-ALGORITHM = "HS256"
+# Keys must be shared by every worker, so they come from configuration: a key
+# set with ids and rotation in JWT_KEYS_FILE, or a single SECRET_KEY
+SECRET_KEY = os.getenv("SECRET_KEY")
+ALGORITHM = os.getenv("ALGORITHM", "HS256")
+keyring = load_keyring(SECRET_KEY, ALGORITHM)
+token_verifier = TokenVerifier(
+    keyring,
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL", "300")),
+)
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 class UserCreate(BaseModel):
@@ -66,10 +74,16 @@ def register(user_create: UserCreate, db: Session = Depends(get_db)):
 
 def authenticate_user(db: Session, username: str, password: str):
     user = get_user_by_username(db, username)
-    if not user or not pwd_context.verify(password, user.hashed_password):
+    if not user:
         return False
-    if not pwd_context.verify(password, user.hashed_password):
+    # One argon2 verify; if the hash was made with older cost settings it is
+    # replaced with one using the current profile
+    verified, new_hash = pwd_context.verify_and_update(password, user.hashed_password)
+    if not verified:
         return False
+    if new_hash:
+        user.hashed_password = new_hash
+        db.commit()
     return user
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -79,7 +93,7 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None):
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = keyring.sign(to_encode)
     return encoded_jwt
 
 @app.post("/token")
@@ -104,7 +118,7 @@ def verify_token(token: str = Depends(oauth2_scheme), db: Session = Depends(get_
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = token_verifier.decode(token)
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
@@ -0,0 +1,33 @@
+import os
+from passlib.context import CryptContext
+
+# argon2id cost settings: rounds = time cost (passes), memory_cost in KiB.
+# "interactive" is the OWASP minimum, "default" is argon2-cffi's default and
+# "sensitive" is for admin accounts or machines with memory to spare. Run
+# bench_argon2.py on the target hardware to pick one.
+PROFILES = {
+    "interactive": {"rounds": 2, "memory_cost": 19456, "parallelism": 1},
+    "default": {"rounds": 3, "memory_cost": 65536, "parallelism": 4},
+    "sensitive": {"rounds": 4, "memory_cost": 262144, "parallelism": 4},
+}
+
+def create_password_context(profile: str | None = None, **overrides) -> CryptContext:
+    """argon2 CryptContext for a named profile.
+
+    ARGON2_PROFILE picks the profile and ARGON2_TIME_COST, ARGON2_MEMORY_COST and
+    ARGON2_PARALLELISM override single settings. Hashes made with other settings
+    still verify and are flagged by verify_and_update for rehashing.
+    """
+    profile = profile or os.getenv("ARGON2_PROFILE", "default")
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown argon2 profile: {profile}")
+    settings = dict(PROFILES[profile])
+    for name, env in (("rounds", "ARGON2_TIME_COST"), ("memory_cost", "ARGON2_MEMORY_COST"), ("parallelism", "ARGON2_PARALLELISM")):
+        if os.getenv(env):
+            settings[name] = int(os.getenv(env))
+    settings.update(overrides)
+    return CryptContext(
+        schemes=["argon2"],
+        deprecated="auto",
+        **{f"argon2__{name}": value for name, value in settings.items()},
+    )
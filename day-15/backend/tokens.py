@@ -0,0 +1,181 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from jose import JWTError, jwk, jwt
+
+# python-jose has no EdDSA; ES256 is the compact-signature option it supports
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+def read_key(name: str) -> str | None:
+    # PEM text from the `name` env var, or from the file named by `name`_FILE
+    path = os.getenv(f"{name}_FILE")
+    if path:
+        with open(path) as f:
+            return f.read()
+    return os.getenv(name)
+
+def load_keys(secret_key: str | None, algorithm: str, private_pem: str | None = None, public_pem: str | None = None):
+    """Build the (signing_key, verifying_key) pair once, at startup.
+
+    HS* algorithms use the shared secret for both. RS*/ES* sign with the
+    private key and verify with the public key (derived from the private key
+    when only that is given), so a node holding just the public key can verify
+    tokens but not mint them. Missing keys come back as None.
+    """
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        key = jwk.construct(secret_key, algorithm) if secret_key else None
+        return key, key
+    signing_key = jwk.construct(private_pem, algorithm) if private_pem else None
+    if public_pem:
+        verifying_key = jwk.construct(public_pem, algorithm)
+    else:
+        verifying_key = signing_key.public_key() if signing_key else None
+    return signing_key, verifying_key
+
+class JWTKey:
+    def __init__(self, kid: str, algorithm: str, signing_key, verifying_key, retire_at: float | None = None):
+        self.kid = kid
+        self.algorithm = algorithm
+        self.signing_key = signing_key
+        self.verifying_key = verifying_key
+        self.retire_at = retire_at
+
+class KeyRing:
+    """Preloaded JWT keys indexed by key id (`kid`).
+
+    Tokens are signed with the active key and carry its kid in the header;
+    verification picks the key by kid, so every worker holding the same key
+    set accepts every other worker's tokens. Old keys stay verify-only until
+    their `retire_at`, which gives rotation an overlapping validity window.
+    A node given only public keys can verify but not sign.
+    """
+
+    def __init__(self, keys: list[JWTKey], active_kid: str):
+        self.keys = {key.kid: key for key in keys}
+        if active_kid not in self.keys:
+            raise RuntimeError(f"Active JWT key {active_kid!r} is not in the key set")
+        self.active_kid = active_kid
+
+    def sign(self, claims: dict) -> str:
+        key = self.keys[self.active_kid]
+        if key.signing_key is None:
+            raise RuntimeError(f"JWT key {key.kid!r} has no signing key on this node")
+        return jwt.encode(claims, key.signing_key, algorithm=key.algorithm, headers={"kid": key.kid})
+
+    def key_for(self, token: str) -> JWTKey:
+        # Tokens without a kid predate key ids and are checked against the active key
+        kid = jwt.get_unverified_header(token).get("kid", self.active_kid)
+        # The header is unverified: a non-string kid (a list, say) is unhashable
+        if not isinstance(kid, str):
+            raise JWTError("Invalid key id")
+        key = self.keys.get(kid)
+        if key is None:
+            raise JWTError("Unknown key id")
+        if key.retire_at is not None and key.retire_at <= time.time():
+            raise JWTError("Key has been retired")
+        return key
+
+def _timestamp(value: str | None) -> float | None:
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+def _pem(entry: dict, name: str) -> str | None:
+    if entry.get(f"{name}_file"):
+        with open(entry[f"{name}_file"]) as f:
+            return f.read()
+    return entry.get(name)
+
+def load_keyring(secret_key: str | None = None, algorithm: str = "HS256") -> KeyRing:
+    """Key set from JWT_KEYS_FILE (or inline JSON in JWT_KEYS), e.g.
+
+        {"active": "2024-06", "keys": [
+            {"kid": "2024-06", "alg": "ES256", "private_key_file": "keys/2024-06.pem"},
+            {"kid": "2024-01", "alg": "HS256", "secret": "...", "retire_at": "2024-06-01T12:30:00+00:00"}]}
+
+    Keys take `secret` for HS*, or `private_key` / `public_key` PEM (or the
+    `_file` variants). Without a key set, a single key with kid "default" is
+    built from secret_key or JWT_PRIVATE_KEY / JWT_PUBLIC_KEY as before.
+    """
+    path = os.getenv("JWT_KEYS_FILE")
+    if path:
+        with open(path) as f:
+            config = json.load(f)
+    elif os.getenv("JWT_KEYS"):
+        config = json.loads(os.getenv("JWT_KEYS"))
+    else:
+        signing_key, verifying_key = load_keys(secret_key, algorithm, read_key("JWT_PRIVATE_KEY"), read_key("JWT_PUBLIC_KEY"))
+        if verifying_key is None:
+            raise RuntimeError("No JWT key configured: set SECRET_KEY, JWT_PRIVATE_KEY(_FILE) or JWT_KEYS_FILE")
+        return KeyRing([JWTKey("default", algorithm, signing_key, verifying_key)], "default")
+
+    keys = []
+    for entry in config["keys"]:
+        signing_key, verifying_key = load_keys(entry.get("secret"), entry["alg"], _pem(entry, "private_key"), _pem(entry, "public_key"))
+        if verifying_key is None:
+            raise RuntimeError(f"JWT key {entry['kid']!r} has no key material")
+        keys.append(JWTKey(entry["kid"], entry["alg"], signing_key, verifying_key, _timestamp(entry.get("retire_at"))))
+    return KeyRing(keys, config["active"])
+
+class TokenVerifier:
+    """Verifies JWTs against a KeyRing and caches the claims of tokens that passed.
+
+    Entries are keyed by the SHA-256 digest of the token, so the cache never
+    holds bearer tokens, and expire at the token's `exp`, its key's
+    `retire_at` or after `ttl` seconds, whichever is first. Failed tokens are
+    never cached. A `maxsize` of 0 turns the cache off.
+    """
+
+    def __init__(self, keyring: KeyRing, maxsize: int = 10000, ttl: float = 300):
+        self.keyring = keyring
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._claims: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str) -> dict:
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(digest)
+            if entry is not None and entry[0] <= now:
+                del self._claims[digest]
+                entry = None
+            if entry is not None:
+                self._claims.move_to_end(digest)
+                self.hits += 1
+                return dict(entry[1])
+            self.misses += 1
+        key = self.keyring.key_for(token)
+        # The algorithm is pinned per key, never taken from the token header
+        claims = jwt.decode(token, key.verifying_key, algorithms=[key.algorithm])
+        if self.maxsize > 0:
+            expires_at = now + self.ttl
+            if isinstance(claims.get("exp"), (int, float)):
+                expires_at = min(expires_at, claims["exp"])
+            if key.retire_at is not None:
+                expires_at = min(expires_at, key.retire_at)
+            with self._lock:
+                self._claims[digest] = (expires_at, claims)
+                self._claims.move_to_end(digest)
+                while len(self._claims) > self.maxsize:
+                    self._claims.popitem(last=False)
+        return dict(claims)
+
+    def invalidate(self):
+        with self._lock:
+            self._claims.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "active_kid": self.keyring.active_kid,
+            "size": len(self._claims),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
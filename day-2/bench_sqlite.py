@@ -0,0 +1,75 @@
+"""Concurrent read/write throughput of the SQLite engine profiles.
+
+    python bench_sqlite.py --readers 16 --writers 4 --seconds 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from sqlite_engine import create_sqlite_engine
+
+
+def run(profile, readers, writers, seconds):
+    path = os.path.join(tempfile.mkdtemp(), f"{profile}.db")
+    engine = create_sqlite_engine(f"sqlite:///{path}", profile=profile)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT, price REAL)"))
+        conn.execute(text("INSERT INTO books (title, price) VALUES ('seed', 1.0)"))
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader():
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(text("SELECT count(*), max(price) FROM books")).one()
+                key = "reads"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    def writer():
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text("INSERT INTO books (title, price) VALUES ('book', 9.99)"))
+                key = "writes"
+            except OperationalError:
+                key = "errors"
+            with lock:
+                counts[key] += 1
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    engine.dispose()
+
+    print(
+        f"{profile:<12} reads/s {counts['reads'] / seconds:>10,.0f}   "
+        f"writes/s {counts['writes'] / seconds:>8,.0f}   errors {counts['errors']:,}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+    for profile in ("default", "production"):
+        run(profile, args.readers, args.writers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
-from fastapi import FastAPI, HTTPException, Depends
-from pydantic import BaseModel, Field
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 import models
 import database
+from sqlalchemy import insert, select, tuple_, update
 from sqlalchemy.orm import Session
+import base64
+import json
+import time
 
 # Create all tables in the database
 models.Base.metadata.create_all(bind=database.engine)
@@ -33,9 +39,117 @@ def create_book(book: Book, db: Session = Depends(get_db)):
     db.commit()
     return book
 
+def encode_cursor(book_id: int) -> str:
+    return base64.urlsafe_b64encode(str(book_id).encode()).decode()
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def book_rows(after_id: int, batch_size: int):
+    # Own session: the request-scoped one is closed before the body is streamed
+    db = database.SessionLocal()
+    try:
+        stmt = (
+            select(models.Books.id, models.Books.title, models.Books.author, models.Books.price)
+            .where(models.Books.id > after_id)
+            .order_by(models.Books.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in db.execute(stmt).partitions():
+            yield "".join(json.dumps(row._asdict()) + "\n" for row in partition)
+    finally:
+        db.close()
+
+def insert_batch(db: Session, batch: list[dict], upsert: bool) -> dict:
+    start = time.perf_counter()
+    updated = []
+    if upsert:
+        # Later rows win when the same title+author appears twice in a batch
+        by_key = {(row["title"], row["author"]): row for row in batch}
+        existing = db.execute(
+            select(models.Books.id, models.Books.title, models.Books.author)
+            .where(tuple_(models.Books.title, models.Books.author).in_(list(by_key)))
+        ).all()
+        # No unique constraint on title+author, so a key can match several
+        # rows; every one of them gets the new values
+        for book_id, title, author in existing:
+            updated.append({"id": book_id, **by_key[(title, author)]})
+        matched = {(title, author) for _, title, author in existing}
+        batch = [row for key, row in by_key.items() if key not in matched]
+    if batch:
+        db.execute(insert(models.Books), batch)
+    if updated:
+        db.execute(update(models.Books), updated)
+    db.commit()
+    return {"inserted": len(batch), "updated": len(updated), "seconds": round(time.perf_counter() - start, 6)}
+
+async def bulk_payloads(request: Request):
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        if buffer.strip():
+            yield json.loads(buffer)
+    else:
+        payload = await request.json()
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=422, detail="Expected a JSON array of books")
+        for item in payload:
+            yield item
+
+@app.post("/bulk")
+async def bulk_create_books(
+    request: Request,
+    db: Session = Depends(get_db),
+    batch_size: int = Query(default=1000, ge=1, le=50000),
+    upsert: bool = False,
+):
+    batches = []
+    batch = []
+    row = 0
+    try:
+        async for item in bulk_payloads(request):
+            row += 1
+            batch.append(Book.model_validate(item).model_dump())
+            if len(batch) == batch_size:
+                batches.append(await run_in_threadpool(insert_batch, db, batch, upsert))
+                batch = []
+    except (ValidationError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid book at row {row}: {e}")
+    if batch:
+        batches.append(await run_in_threadpool(insert_batch, db, batch, upsert))
+    return {
+        "inserted": sum(b["inserted"] for b in batches),
+        "updated": sum(b["updated"] for b in batches),
+        "batches": batches,
+    }
+
 @app.get("/")
-def get_books(db: Session = Depends(get_db)):
-    return db.query(models.Books).all()
+def get_books(
+    db: Session = Depends(get_db),
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+    stream: bool = False,
+):
+    after_id = decode_cursor(cursor) if cursor else 0
+    if stream:
+        return StreamingResponse(book_rows(after_id, batch_size=1000), media_type="application/x-ndjson")
+    items = (
+        db.query(models.Books)
+        .filter(models.Books.id > after_id)
+        .order_by(models.Books.id)
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = encode_cursor(items[limit - 1].id) if len(items) > limit else None
+    return {"items": items[:limit], "next_cursor": next_cursor}
 
 @app.get("/{book_id}")
 def get_book(book_id: int):
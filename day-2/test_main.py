@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/books_test.db"
+
+from fastapi.testclient import TestClient
+
+from books import app
+
+client = TestClient(app)
+
+def test_upsert_updates_every_duplicate():
+    # POST / with defaults twice leaves two identical title+author rows
+    client.post("/", json={})
+    client.post("/", json={})
+    response = client.post("/bulk?upsert=true", json=[
+        {"title": "The Great Gatsby", "author": "F. Scott Fitzgerald", "price": 12.5},
+        {"title": "Tender Is the Night", "author": "F. Scott Fitzgerald", "price": 9.0},
+    ])
+    assert response.status_code == 200
+    assert response.json()["inserted"] == 1
+    assert response.json()["updated"] == 2
+    items = client.get("/").json()["items"]
+    assert [book["price"] for book in items if book["title"] == "The Great Gatsby"] == [12.5, 12.5]
+
+def test_in_memory_url_skips_pool_settings():
+    from sqlite_engine import create_sqlite_engine
+    engine = create_sqlite_engine("sqlite://", profile="production")
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("select 1").scalar() == 1
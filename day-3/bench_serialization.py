@@ -0,0 +1,70 @@
+"""List serialization: list_serial + JSON vs server-side projection + orjson.
+
+    pip install mongomock-motor orjson
+    python bench_serialization.py --docs 100000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from mongomock_motor import AsyncMongoMockClient
+
+from config import database
+from crud import todos as crud
+from schema.schemas import list_serial, list_serial_json
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+async def best_of_async(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+async def old_list():
+    # What GET / did before: decode full documents, rebuild dicts, let FastAPI encode them
+    docs = await database.get_collection().find().to_list(length=None)
+    return json.dumps(jsonable_encoder(list_serial(docs))).encode()
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Documents as the driver hands them over, for the encode-only comparison
+    docs = [
+        {"_id": ObjectId(), "title": f"todo {i}", "description": "x" * 40, "completed": i % 2 == 0}
+        for i in range(args.docs)
+    ]
+    projected = [{"id": str(d["_id"]), "title": d["title"], "description": d["description"], "completed": d["completed"]} for d in docs]
+
+    print(f"{args.docs:,} documents, best of {args.repeat}")
+    print(f"{'list_serial + jsonable_encoder + json':<40} {best_of(lambda: json.dumps(jsonable_encoder(list_serial(docs))), args.repeat):>10.1f} ms")
+    print(f"{'projected docs + orjson':<40} {best_of(lambda: list_serial_json(projected), args.repeat):>10.1f} ms")
+
+    # End to end through the data layer, against an in-memory mongomock stand-in
+    database.connect(AsyncMongoMockClient())
+    await database.get_collection().insert_many(docs)
+    print(f"{'GET / before (mongomock)':<40} {await best_of_async(old_list, args.repeat):>10.1f} ms")
+    print(f"{'GET / now (mongomock)':<40} {await best_of_async(crud.list_todos_json, args.repeat):>10.1f} ms")
+    database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
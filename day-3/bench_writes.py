@@ -0,0 +1,55 @@
+"""Write latency of the todo routes as the collection grows, against mongomock.
+
+    pip install mongomock-motor
+    python bench_writes.py --sizes 1000 10000 50000
+"""
+import argparse
+import asyncio
+import time
+
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from config import database
+from crud import todos as crud
+from models.todos import Todo
+from schema.schemas import list_serial
+
+
+async def old_update(id: str, todo: Todo):
+    collection = database.get_collection()
+    await collection.find_one_and_update({"_id": ObjectId(id)}, {"$set": dict(todo)})
+    return list_serial(await collection.find().to_list(length=None))
+
+
+async def timed(fn, ops):
+    start = time.perf_counter()
+    for _ in range(ops):
+        await fn()
+    return (time.perf_counter() - start) / ops * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--ops", type=int, default=20)
+    args = parser.parse_args()
+
+    # In-memory stand-in for Atlas, no credentials or network needed
+    database.connect(AsyncMongoMockClient())
+    collection = database.get_collection()
+    todo = Todo(title="bench", description="write latency", completed=False)
+    print(f"{'documents':>10} {'old update ms':>14} {'new update ms':>14} {'new create ms':>14}")
+    for size in args.sizes:
+        await collection.delete_many({})
+        await collection.insert_many([dict(todo) for _ in range(size)])
+        target = str((await collection.find_one())["_id"])
+        old = await timed(lambda: old_update(target, todo), args.ops)
+        new = await timed(lambda: crud.update_todo(target, todo), args.ops)
+        create = await timed(lambda: crud.create_todo(todo), args.ops)
+        print(f"{size:>10,} {old:>14.3f} {new:>14.3f} {create:>14.3f}")
+    database.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,6 @@
 import os
 from urllib.parse import quote_plus
-from pymongo.mongo_client import MongoClient
-from pymongo.server_api import ServerApi
+from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv, find_dotenv
 
 # Load .env from project tree regardless of cwd
@@ -15,13 +14,40 @@ password = quote_plus(password_raw)
 cluster_url = os.getenv("MONGODB_CLUSTER_URL", "test-cluster.fqaqn7y.mongodb.net")
 app_name = os.getenv("MONGODB_APP_NAME", "test-cluster")
 
-if not username_raw or not password_raw:
-    raise RuntimeError("Missing MongoDB credentials: set MONGODB_USERNAME and MONGODB_PASSWORD in environment or .env")
+# Connection pool sizing; one client is shared by every request in the worker
+max_pool_size = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+min_pool_size = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+server_selection_timeout_ms = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+connect_timeout_ms = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "5000"))
 
-uri = f"mongodb+srv://{username}:{password}@{cluster_url}/?retryWrites=true&w=majority&appName={app_name}"
+client: AsyncIOMotorClient | None = None
+collection_name = None
 
-client = MongoClient(uri)
+def build_uri() -> str:
+    if not username_raw or not password_raw:
+        raise RuntimeError("Missing MongoDB credentials: set MONGODB_USERNAME and MONGODB_PASSWORD in environment or .env")
+    return f"mongodb+srv://{username}:{password}@{cluster_url}/?retryWrites=true&w=majority&appName={app_name}"
 
-db = client.todo_db
+def connect(mongo_client: AsyncIOMotorClient | None = None):
+    global client, collection_name
+    client = mongo_client or AsyncIOMotorClient(
+        build_uri(),
+        maxPoolSize=max_pool_size,
+        minPoolSize=min_pool_size,
+        serverSelectionTimeoutMS=server_selection_timeout_ms,
+        connectTimeoutMS=connect_timeout_ms,
+    )
+    collection_name = client.todo_db["todo_collection"]
+    return client
 
-collection_name = db["todo_collection"]
\ No newline at end of file
+def close():
+    global client, collection_name
+    if client is not None:
+        client.close()
+    client = None
+    collection_name = None
+
+def get_collection():
+    if collection_name is None:
+        raise RuntimeError("MongoDB client is not connected; run the app with its lifespan handler")
+    return collection_name
@@ -0,0 +1,31 @@
+from bson import ObjectId
+from pymongo import ReturnDocument
+from config.database import get_collection
+from models.todos import Todo
+from schema.schemas import SERIAL_PROJECTION, individual_serial, list_serial, list_serial_json
+
+TODO_PROJECTION = {"title": 1, "description": 1, "completed": 1}
+
+async def list_todos_json() -> bytes:
+    cursor = get_collection().aggregate([{"$project": SERIAL_PROJECTION}], batchSize=1000)
+    return list_serial_json(await cursor.to_list(length=None))
+
+async def list_todos_page(skip: int, limit: int) -> list:
+    cursor = get_collection().find({}, TODO_PROJECTION).sort("_id", 1).skip(skip).limit(limit)
+    return list_serial(await cursor.to_list(length=limit))
+
+async def create_todo(todo: Todo) -> dict:
+    doc = dict(todo)
+    result = await get_collection().insert_one(doc)
+    doc["_id"] = result.inserted_id
+    return individual_serial(doc)
+
+async def update_todo(id: str, todo: Todo) -> dict | None:
+    doc = await get_collection().find_one_and_update(
+        {"_id": ObjectId(id)}, {"$set": dict(todo)}, projection=TODO_PROJECTION, return_document=ReturnDocument.AFTER
+    )
+    return individual_serial(doc) if doc is not None else None
+
+async def delete_todo(id: str) -> dict | None:
+    doc = await get_collection().find_one_and_delete({"_id": ObjectId(id)}, projection=TODO_PROJECTION)
+    return individual_serial(doc) if doc is not None else None
@@ -1,9 +1,15 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from pymongo.mongo_client import MongoClient
-from pymongo.server_api import ServerApi
+from config import database
 from routes.route import router
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    database.connect()
+    yield
+    database.close()
 
+app = FastAPI(lifespan=lifespan)
 
-app.include_router(router)
\ No newline at end of file
+
+app.include_router(router)
@@ -1,26 +1,39 @@
-from fastapi import APIRouter
-from schema.schemas import list_serial
-from config.database import collection_name
+from typing import Annotated, Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from crud import todos as crud
 from models.todos import Todo
-from bson import ObjectId
 
 router = APIRouter()
 
+def include_params(
+    include: Literal["list"] | None = None,
+    skip: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+) -> dict:
+    return {"include": include, "skip": skip, "limit": limit}
+
+include_dependency = Annotated[dict, Depends(include_params)]
+
+# Writes return only the affected todo; ?include=list adds one page of the list
+async def write_response(todo: dict | None, params: dict):
+    if todo is None:
+        raise HTTPException(status_code=404, detail="Todo not found")
+    if params["include"] == "list":
+        return {"todo": todo, "todos": await crud.list_todos_page(params["skip"], params["limit"])}
+    return todo
+
 @router.get("/")
-def get_todos():
-    return list_serial(collection_name.find())
+async def get_todos():
+    return Response(content=await crud.list_todos_json(), media_type="application/json")
 
 @router.post("/")
-def create_todo(todo: Todo):
-    collection_name.insert_one(dict(todo))
-    return list_serial(collection_name.find())
+async def create_todo(todo: Todo, params: include_dependency):
+    return await write_response(await crud.create_todo(todo), params)
 
 @router.put("/{id}")
-def update_todo(id: str, todo: Todo):
-    collection_name.find_one_and_update({"_id": ObjectId(id)}, {"$set": dict(todo)})
-    return list_serial(collection_name.find())
+async def update_todo(id: str, todo: Todo, params: include_dependency):
+    return await write_response(await crud.update_todo(id, todo), params)
 
 @router.delete("/{id}")
-def delete_todo(id: str):
-    collection_name.find_one_and_delete({"_id": ObjectId(id)})
-    return list_serial(collection_name.find())
\ No newline at end of file
+async def delete_todo(id: str, params: include_dependency):
+    return await write_response(await crud.delete_todo(id), params)
@@ -1,3 +1,5 @@
+import orjson
+
 def individual_serial(todo) -> dict:
     return {
         "id": str(todo["_id"]),
@@ -7,4 +9,17 @@ def individual_serial(todo) -> dict:
     }
 
 def list_serial(todos) -> list:
-    return [individual_serial(todo) for todo in todos]
\ No newline at end of file
+    return [individual_serial(todo) for todo in todos]
+
+# Same shape as individual_serial, built by MongoDB in an aggregation stage so
+# _id is stringified server-side and documents arrive ready to encode
+SERIAL_PROJECTION = {
+    "_id": 0,
+    "id": {"$toString": "$_id"},
+    "title": "$title",
+    "description": "$description",
+    "completed": "$completed",
+}
+
+def list_serial_json(todos) -> bytes:
+    return orjson.dumps(todos)
@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+from sqlalchemy.orm import Session
+from models import Choice, Question
+
+class AnswerKeyCache:
+    """LRU cache of question id -> ids of its correct choices."""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._keys: OrderedDict[int, frozenset[int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, db: Session, question_ids) -> dict[int, frozenset[int]]:
+        found = {}
+        missing = []
+        with self._lock:
+            for question_id in set(question_ids):
+                key = self._keys.get(question_id)
+                if key is None:
+                    missing.append(question_id)
+                else:
+                    self._keys.move_to_end(question_id)
+                    found[question_id] = key
+            self.hits += len(found)
+            self.misses += len(missing)
+        if missing:
+            found.update(self._load(db, missing))
+        return found
+
+    def _load(self, db: Session, question_ids: list[int]) -> dict[int, frozenset[int]]:
+        # One query for every missing question; ids that don't exist are left out
+        correct = {question_id: set() for question_id in question_ids}
+        rows = (
+            db.query(Question.id, Choice.id, Choice.is_correct)
+            .outerjoin(Choice, Choice.question_id == Question.id)
+            .filter(Question.id.in_(question_ids))
+        )
+        seen = set()
+        for question_id, choice_id, is_correct in rows:
+            seen.add(question_id)
+            if is_correct:
+                correct[question_id].add(choice_id)
+        loaded = {question_id: frozenset(correct[question_id]) for question_id in seen}
+        with self._lock:
+            for question_id, key in loaded.items():
+                self._keys[question_id] = key
+                self._keys.move_to_end(question_id)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return loaded
+
+    def invalidate(self, question_ids=None):
+        with self._lock:
+            if question_ids is None:
+                self._keys.clear()
+            else:
+                for question_id in question_ids:
+                    self._keys.pop(question_id, None)
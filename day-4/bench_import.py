@@ -0,0 +1,38 @@
+"""Time POST /questions/bulk against a local SQLite stand-in.
+
+    DATABASE_URL=sqlite:///./bench_quiz.db python bench_import.py --questions 10000
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench_quiz.db")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from main import app  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--questions", type=int, default=10_000)
+    parser.add_argument("--choices", type=int, default=4)
+    args = parser.parse_args()
+
+    payload = [
+        {
+            "question_text": f"Question {i}?",
+            "choices": [{"choice_text": f"Answer {j}", "is_correct": j == 0} for j in range(args.choices)],
+        }
+        for i in range(args.questions)
+    ]
+    client = TestClient(app)
+    start = time.perf_counter()
+    response = client.post("/questions/bulk", json=payload)
+    elapsed = time.perf_counter() - start
+    response.raise_for_status()
+    print(f"imported {args.questions:,} questions with {args.questions * args.choices:,} choices in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
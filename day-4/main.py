@@ -1,11 +1,14 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
 
 from typing import Annotated, List
 import models
 from database import SessionLocal, engine
-from sqlalchemy.orm import Session
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, selectinload
 from models import Question, Choice
+from answer_keys import AnswerKeyCache
+import os
 
 models.Base.metadata.create_all(bind=engine)
 
@@ -20,6 +23,11 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+# New questions can't be cached yet, so creating them needs no invalidation.
+# A route that edits or deletes questions or choices must call
+# answer_keys.invalidate(question_ids) after its commit.
+answer_keys = AnswerKeyCache(maxsize=int(os.getenv("ANSWER_KEY_CACHE_SIZE", "10000")))
+
 class ChoiceBase(BaseModel):
     choice_text: str
     is_correct: bool
@@ -28,24 +36,132 @@ class QuestionBase(BaseModel):
     question_text: str
     choices: List[ChoiceBase]
 
+class AnswerSubmission(BaseModel):
+    question_id: int
+    choice_ids: List[int]
+
+class QuizSubmission(BaseModel):
+    answers: List[AnswerSubmission]
+
+class ChoiceModel(ChoiceBase):
+    id: int
+    class Config:
+        from_attributes = True
+
+class QuestionModel(BaseModel):
+    id: int
+    question_text: str
+    choices: List[ChoiceModel]
+    class Config:
+        from_attributes = True
+
+def build_question(question: QuestionBase) -> Question:
+    # Choices ride along via the relationship cascade, so one flush inserts the whole graph
+    return Question(
+        question_text=question.question_text,
+        choices=[Choice(choice_text=c.choice_text, is_correct=c.is_correct) for c in question.choices],
+    )
+
 @app.post("/questions/")
 async def create_question(question: QuestionBase, db: db_dependency):
-    new_question = models.Question(question_text=question.question_text)
+    new_question = build_question(question)
     db.add(new_question)
     db.commit()
     db.refresh(new_question)
-    for choice in question.choices:
-        new_choice = models.Choice(choice_text=choice.choice_text, is_correct=choice.is_correct, question_id=new_question.id)
-        db.add(new_choice)
-    db.commit()
-    db.refresh(new_choice)
     return new_question
+
+@app.post("/questions/bulk", response_model=List[QuestionModel])
+def create_questions_bulk(questions: List[QuestionBase], db: db_dependency):
+    if not questions:
+        return []
+    # Two multi-row INSERT ... RETURNING statements and one commit for the whole import
+    question_ids = db.scalars(
+        insert(Question).returning(Question.id, sort_by_parameter_order=True),
+        [{"question_text": q.question_text} for q in questions],
+    ).all()
+    choice_rows = [
+        {"question_id": question_id, "choice_text": c.choice_text, "is_correct": c.is_correct}
+        for question_id, q in zip(question_ids, questions)
+        for c in q.choices
+    ]
+    choice_ids = iter(db.scalars(
+        insert(Choice).returning(Choice.id, sort_by_parameter_order=True),
+        choice_rows,
+    ).all() if choice_rows else [])
+    db.commit()
+    return [
+        {
+            "id": question_id,
+            "question_text": q.question_text,
+            "choices": [{"id": next(choice_ids), **c.model_dump()} for c in q.choices],
+        }
+        for question_id, q in zip(question_ids, questions)
+    ]
     
 @app.get("/questions/")
 async def get_questions(db: Session = Depends(get_db)):
     questions = db.query(Question).all()
     return questions
 
+QUESTION_FIELDS = {"id", "question_text", "choices"}
+CHOICE_FIELDS = {"id", "choice_text", "is_correct"}
+
+def parse_fields(fields: str | None) -> tuple[set, set]:
+    # "id,question_text,choices.choice_text" -> question fields, choice fields
+    if fields is None:
+        return QUESTION_FIELDS, CHOICE_FIELDS
+    question_fields, choice_fields = set(), set()
+    for name in filter(None, (f.strip() for f in fields.split(","))):
+        if name.startswith("choices."):
+            question_fields.add("choices")
+            choice_fields.add(name.removeprefix("choices."))
+        elif name == "choices":
+            choice_fields |= CHOICE_FIELDS
+            question_fields.add(name)
+        else:
+            question_fields.add(name)
+    unknown = (question_fields - QUESTION_FIELDS) | (choice_fields - CHOICE_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return question_fields, choice_fields
+
+@app.get("/quizzes")
+def get_quizzes(
+    db: db_dependency,
+    after: int = 0,
+    limit: int = Query(default=50, ge=1, le=500),
+    fields: str | None = None,
+):
+    question_fields, choice_fields = parse_fields(fields)
+    query = db.query(Question).filter(Question.id > after).order_by(Question.id).limit(limit)
+    if "choices" in question_fields:
+        # One extra SELECT ... WHERE question_id IN (...) for the whole page
+        query = query.options(selectinload(Question.choices))
+    quizzes = []
+    for question in query.all():
+        item = {name: getattr(question, name) for name in question_fields - {"choices"}}
+        if "choices" in question_fields:
+            item["choices"] = [{name: getattr(c, name) for name in choice_fields} for c in question.choices]
+        quizzes.append(item)
+    return quizzes
+
+@app.post("/quizzes/score")
+def score_quizzes(submissions: List[QuizSubmission], db: db_dependency):
+    # Answer keys come from the in-process cache; only uncached questions hit the database
+    keys = answer_keys.get_many(db, (a.question_id for s in submissions for a in s.answers))
+    unknown = {a.question_id for s in submissions for a in s.answers} - keys.keys()
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown question ids: {sorted(unknown)}")
+    results = []
+    for submission in submissions:
+        correct = [keys[a.question_id] == frozenset(a.choice_ids) for a in submission.answers]
+        results.append({
+            "score": sum(correct),
+            "total": len(correct),
+            "results": [{"question_id": a.question_id, "correct": c} for a, c in zip(submission.answers, correct)],
+        })
+    return results
+
 @app.get("/choices/{question_id}")
 async def get_choices(question_id: int, db: Session = Depends(get_db)):
     choices = db.query(Choice).filter(Choice.question_id == question_id).all()
@@ -1,14 +1,17 @@
 from sqlalchemy import Column, Integer, String, Boolean, ForeignKey
+from sqlalchemy.orm import relationship
 from database import Base
 
 class Question(Base):
     __tablename__ = "questions"
     id = Column(Integer, primary_key=True, index=True)
     question_text = Column(String, index=True)
+    choices = relationship("Choice", back_populates="question", cascade="all, delete-orphan")
 
 class Choice(Base):
     __tablename__ = "choices"
     id = Column(Integer, primary_key=True, index=True)
     choice_text = Column(String, index=True)
     is_correct = Column(Boolean, index=True)
-    question_id = Column(Integer, ForeignKey("questions.id"))
\ No newline at end of file
+    question_id = Column(Integer, ForeignKey("questions.id"), index=True)
+    question = relationship("Question", back_populates="choices")
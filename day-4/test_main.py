@@ -0,0 +1,91 @@
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/quiz_test.db"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from database import SessionLocal, engine
+from main import answer_keys, app
+from models import Choice
+
+client = TestClient(app)
+
+@pytest.fixture
+def query_count():
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", count)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count)
+
+def seed(n):
+    payload = [
+        {"question_text": f"Question {i}", "choices": [{"choice_text": f"Choice {j}", "is_correct": j == 0} for j in range(3)]}
+        for i in range(n)
+    ]
+    return client.post("/questions/bulk", json=payload).json()
+
+def test_get_quizzes_nests_choices():
+    created = seed(2)
+    response = client.get("/quizzes", params={"after": created[0]["id"] - 1, "limit": 2})
+    assert response.status_code == 200
+    assert [q["id"] for q in response.json()] == [q["id"] for q in created]
+    assert [len(q["choices"]) for q in response.json()] == [3, 3]
+
+def test_get_quizzes_query_count_is_constant(query_count):
+    seed(20)
+    query_count.clear()
+    client.get("/quizzes", params={"limit": 5})
+    small = len(query_count)
+    query_count.clear()
+    client.get("/quizzes", params={"limit": 20})
+    assert len(query_count) == small == 2
+
+def test_get_quizzes_field_selection():
+    created = seed(1)
+    response = client.get("/quizzes", params={"after": created[0]["id"] - 1, "limit": 1, "fields": "id,choices.choice_text"})
+    assert response.json() == [{"id": created[0]["id"], "choices": [{"choice_text": f"Choice {j}"} for j in range(3)]}]
+
+def test_get_quizzes_unknown_field():
+    response = client.get("/quizzes", params={"fields": "answer"})
+    assert response.status_code == 400
+
+def test_score_quizzes_uses_cached_answer_keys(query_count):
+    created = seed(2)
+    submission = {
+        "answers": [
+            {"question_id": q["id"], "choice_ids": [q["choices"][i]["id"]]}
+            for q, i in zip(created, [0, 1])
+        ]
+    }
+    query_count.clear()
+    response = client.post("/quizzes/score", json=[submission, submission])
+    assert response.status_code == 200
+    assert [r["score"] for r in response.json()] == [1, 1]
+    assert response.json()[0]["results"][1] == {"question_id": created[1]["id"], "correct": False}
+    assert len(query_count) == 1
+    query_count.clear()
+    client.post("/quizzes/score", json=[submission])
+    assert query_count == []
+
+def test_score_after_answer_change_needs_invalidation():
+    question = seed(1)[0]
+    first, second = question["choices"][0]["id"], question["choices"][1]["id"]
+    submission = {"answers": [{"question_id": question["id"], "choice_ids": [second]}]}
+    assert client.post("/quizzes/score", json=[submission]).json()[0]["score"] == 0
+    with SessionLocal() as db:
+        db.get(Choice, first).is_correct = False
+        db.get(Choice, second).is_correct = True
+        db.commit()
+    # Still the cached key until it is invalidated
+    assert client.post("/quizzes/score", json=[submission]).json()[0]["score"] == 0
+    answer_keys.invalidate([question["id"]])
+    assert client.post("/quizzes/score", json=[submission]).json()[0]["score"] == 1
+
+def test_score_quizzes_unknown_question():
+    response = client.post("/quizzes/score", json=[{"answers": [{"question_id": 999999, "choice_ids": [1]}]}])
+    assert response.status_code == 404
@@ -0,0 +1,83 @@
+"""p50/p99 latency of a deep transactions page: OFFSET vs keyset on (date, id).
+
+    python bench_pagination.py --rows 5000000 --page 10000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+import models
+import queries
+from sqlite_engine import create_sqlite_engine
+
+
+def seed(engine, rows):
+    start = date(2015, 1, 1)
+    conn = engine.raw_connection()
+    try:
+        cursor = conn.cursor()
+        batch = []
+        for i in range(1, rows + 1):
+            day = (start + timedelta(days=random.randrange(3650))).isoformat()
+            batch.append((i, round(random.uniform(1, 500), 2), f"tx {i}", i % 3 == 0, day))
+            if len(batch) == 100_000:
+                cursor.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?)", batch)
+                batch = []
+        if batch:
+            cursor.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?)", batch)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_finance.db")
+    engine = create_sqlite_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    seed(engine, args.rows)
+    print(f"seeded {args.rows:,} rows in {time.perf_counter() - start:.1f}s")
+
+    Session = sessionmaker(bind=engine)
+    T = models.Transaction
+    skip = args.page * args.limit
+    with Session() as db:
+        anchor = db.query(T).order_by(T.date.desc(), T.id.desc()).offset(skip - 1).limit(1).one()
+        cursor = queries.encode_cursor(anchor)
+
+        offset_times, keyset_times = [], []
+        for _ in range(args.runs):
+            t = time.perf_counter()
+            offset_rows = db.query(T).order_by(T.date.desc(), T.id.desc()).offset(skip).limit(args.limit).all()
+            offset_times.append(time.perf_counter() - t)
+            t = time.perf_counter()
+            keyset_rows, _ = queries.list_transactions(db, args.limit, cursor)
+            keyset_times.append(time.perf_counter() - t)
+            db.expunge_all()
+        assert [r.id for r in offset_rows] == [r.id for r in keyset_rows]
+
+    for label, samples in (("OFFSET", offset_times), ("keyset", keyset_times)):
+        p50, p99 = percentiles(samples)
+        print(f"page {args.page:,} {label:<7} p50 {p50 * 1000:8.2f} ms   p99 {p99 * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,19 @@
-from fastapi import FastAPI, HTTPException, Depends
-from typing import Annotated, List
+from fastapi import FastAPI, HTTPException, Depends, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import Annotated, List, Literal
+from datetime import date
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from database import SessionLocal, engine
 import models
-from pydantic import BaseModel
+import rollups
+import queries
+from migrations import migrate_date_column
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from fastapi.middleware.cors import CORSMiddleware
+import csv
+import io
+import json
 
 app = FastAPI()
 
@@ -14,10 +23,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+migrated = migrate_date_column(engine)
 models.Base.metadata.create_all(bind=engine)
 
+# Fill the rollup table for databases created before it existed or just migrated
+with SessionLocal() as db:
+    if migrated or (db.query(models.TransactionDaily).first() is None and db.query(models.Transaction).first() is not None):
+        rollups.rebuild_rollups(db)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -32,7 +48,7 @@ class TransactionBase(BaseModel):
     amount: float
     description: str
     is_income: bool
-    date: str
+    date: date
 
 class TransactionModel(TransactionBase):
     id: int
@@ -43,12 +59,113 @@ class TransactionModel(TransactionBase):
 async def create_transaction(transaction: TransactionBase, db: db_dependency):
     transaction_model = models.Transaction(**transaction.dict())
     db.add(transaction_model)
+    rollups.add_to_rollups(db, [transaction_model])
     db.commit()
     db.refresh(transaction_model)
     return transaction_model
 
+transaction_batch = TypeAdapter(List[TransactionBase])
+EXPORT_COLUMNS = ["id", "amount", "description", "is_income", "date"]
+
+def upload_records(file: UploadFile, fmt: str):
+    # UploadFile is spooled to disk, so both readers walk it line by line.
+    # utf-8-sig drops the BOM that spreadsheet and bank exports often start with
+    text = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        yield from csv.DictReader(text)
+    else:
+        for line in text:
+            if line.strip():
+                yield json.loads(line)
+
+def insert_transactions(db: Session, batch: list[dict]) -> int:
+    transactions = transaction_batch.validate_python(batch)
+    db.execute(insert(models.Transaction), [t.model_dump() for t in transactions])
+    rollups.add_to_rollups(db, transactions)
+    db.commit()
+    return len(transactions)
+
+@app.post("/transactions/import")
+def import_transactions(
+    file: UploadFile,
+    db: db_dependency,
+    format: Literal["csv", "ndjson"] | None = None,
+    batch_size: int = Query(default=5000, ge=1, le=50000),
+):
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    imported = 0
+    batch = []
+    try:
+        for record in upload_records(file, fmt):
+            batch.append(record)
+            if len(batch) == batch_size:
+                imported += insert_transactions(db, batch)
+                batch = []
+        if batch:
+            imported += insert_transactions(db, batch)
+    except (ValidationError, ValueError, csv.Error) as e:
+        raise HTTPException(status_code=422, detail=f"Invalid transaction after row {imported}: {e}")
+    return {"imported": imported}
+
+def export_chunks(fmt: str, start_date: date | None, end_date: date | None):
+    # Own session: the request-scoped one is closed before the body is streamed
+    db = SessionLocal()
+    try:
+        T = models.Transaction
+        stmt = select(T.id, T.amount, T.description, T.is_income, T.date).order_by(T.date, T.id)
+        if start_date is not None:
+            stmt = stmt.where(T.date >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(T.date <= end_date)
+        if fmt == "csv":
+            yield ",".join(EXPORT_COLUMNS) + "\r\n"
+        for partition in db.execute(stmt.execution_options(yield_per=5000)).partitions():
+            buffer = io.StringIO()
+            if fmt == "csv":
+                csv.writer(buffer).writerows(partition)
+            else:
+                for row in partition:
+                    buffer.write(json.dumps({**row._asdict(), "date": row.date.isoformat()}) + "\n")
+            yield buffer.getvalue()
+    finally:
+        db.close()
+
+@app.get("/transactions/export")
+def export_transactions(
+    format: Literal["csv", "ndjson"] = "csv",
+    start_date: date | None = None,
+    end_date: date | None = None,
+):
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_chunks(format, start_date, end_date),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=transactions.{format}"},
+    )
+
 @app.get("/transactions", response_model=List[TransactionModel])
-async def get_transactions(db: db_dependency, skip: int = 0, limit: int = 100):
-    transactions = db.query(models.Transaction).offset(skip).limit(limit).all()
+async def get_transactions(
+    db: db_dependency,
+    response: Response,
+    limit: int = Query(default=100, ge=1, le=1000),
+    cursor: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    is_income: bool | None = None,
+):
+    try:
+        transactions, next_cursor = queries.list_transactions(db, limit, cursor, start_date, end_date, is_income)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
     return transactions
-    
\ No newline at end of file
+
+@app.get("/transactions/summary")
+async def get_transactions_summary(
+    db: db_dependency,
+    group_by: Literal["day", "month"] = "month",
+    start: str | None = None,
+    end: str | None = None,
+):
+    return rollups.summarize(db, group_by, start, end)
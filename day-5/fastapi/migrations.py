@@ -0,0 +1,35 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+import models
+
+def migrate_date_column(engine: Engine) -> bool:
+    """Rebuild a pre-Date transactions table (date stored as free-form text).
+
+    SQLite can't change a column's type in place, so the old table is renamed,
+    the current one is created with its indexes, and rows are copied across with
+    date() normalising the text to YYYY-MM-DD. Rows whose date can't be parsed
+    are kept in transactions_invalid_dates. Returns True if anything was migrated;
+    safe to call on every startup.
+    """
+    inspector = inspect(engine)
+    if "transactions" not in inspector.get_table_names():
+        return False
+    date_column = next(c for c in inspector.get_columns("transactions") if c["name"] == "date")
+    if str(date_column["type"]).upper() == "DATE":
+        return False
+    with engine.begin() as conn:
+        for index in inspector.get_indexes("transactions"):
+            conn.execute(text(f'DROP INDEX "{index["name"]}"'))
+        conn.execute(text("ALTER TABLE transactions RENAME TO transactions_old"))
+        models.Transaction.__table__.create(conn)
+        conn.execute(text(
+            "INSERT INTO transactions (id, amount, description, is_income, date) "
+            "SELECT id, amount, description, is_income, date(substr(date, 1, 10)) "
+            "FROM transactions_old WHERE date(substr(date, 1, 10)) IS NOT NULL"
+        ))
+        conn.execute(text("DELETE FROM transactions_old WHERE date(substr(date, 1, 10)) IS NOT NULL"))
+        if conn.execute(text("SELECT count(*) FROM transactions_old")).scalar():
+            conn.execute(text("ALTER TABLE transactions_old RENAME TO transactions_invalid_dates"))
+        else:
+            conn.execute(text("DROP TABLE transactions_old"))
+    return True
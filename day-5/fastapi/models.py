@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean
+from sqlalchemy import Column, Integer, String, Float, Boolean, Date, Index
 from database import Base
 
 class Transaction(Base):
@@ -7,4 +7,17 @@ class Transaction(Base):
     amount = Column(Float)
     description = Column(String)
     is_income = Column(Boolean)
-    date = Column(String)
\ No newline at end of file
+    date = Column(Date, nullable=False)
+
+    __table_args__ = (
+        Index("ix_transactions_date_id", "date", "id"),
+        Index("ix_transactions_is_income_date", "is_income", "date"),
+    )
+
+class TransactionDaily(Base):
+    # Running totals per day and type, kept in step with transactions by rollups.py
+    __tablename__ = "transaction_daily"
+    day = Column(String, primary_key=True)
+    is_income = Column(Boolean, primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
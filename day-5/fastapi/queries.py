@@ -0,0 +1,37 @@
+import base64
+from datetime import date
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+import models
+
+def encode_cursor(transaction: models.Transaction) -> str:
+    return base64.urlsafe_b64encode(f"{transaction.date.isoformat()}|{transaction.id}".encode()).decode()
+
+def decode_cursor(cursor: str) -> tuple[date, int]:
+    day, transaction_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    return date.fromisoformat(day), int(transaction_id)
+
+def list_transactions(
+    db: Session,
+    limit: int,
+    cursor: str | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    is_income: bool | None = None,
+) -> tuple[list, str | None]:
+    # Newest first, keyset on (date, id) so every page is an index range scan
+    T = models.Transaction
+    query = db.query(T)
+    if is_income is not None:
+        query = query.filter(T.is_income == is_income)
+    if start_date is not None:
+        query = query.filter(T.date >= start_date)
+    if end_date is not None:
+        query = query.filter(T.date <= end_date)
+    if cursor is not None:
+        after_date, after_id = decode_cursor(cursor)
+        # Row-value comparison, which SQLite turns into an index range search
+        query = query.filter(tuple_(T.date, T.id) < tuple_(after_date, after_id))
+    rows = query.order_by(T.date.desc(), T.id.desc()).limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
@@ -0,0 +1,71 @@
+from collections import defaultdict
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session
+import models
+
+def day_bucket(date) -> str:
+    return str(date)[:10]
+
+def add_to_rollups(db: Session, transactions):
+    # Caller commits, so the rollup moves in the same transaction as the rows
+    totals = defaultdict(lambda: [0.0, 0])
+    for t in transactions:
+        bucket = totals[(day_bucket(t.date), bool(t.is_income))]
+        bucket[0] += t.amount
+        bucket[1] += 1
+    if not totals:
+        return
+    stmt = insert(models.TransactionDaily).values([
+        {"day": day, "is_income": is_income, "total": total, "count": count}
+        for (day, is_income), (total, count) in totals.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day", "is_income"],
+        set_={
+            "total": models.TransactionDaily.total + stmt.excluded.total,
+            "count": models.TransactionDaily.count + stmt.excluded.count,
+        },
+    )
+    db.execute(stmt)
+
+def rebuild_rollups(db: Session):
+    db.query(models.TransactionDaily).delete()
+    day = func.substr(models.Transaction.date, 1, 10)
+    rows = db.execute(
+        select(day, models.Transaction.is_income, func.sum(models.Transaction.amount), func.count())
+        .group_by(day, models.Transaction.is_income)
+    ).all()
+    db.add_all(
+        models.TransactionDaily(day=d, is_income=bool(is_income), total=total, count=count)
+        for d, is_income, total, count in rows
+    )
+    db.commit()
+
+def summarize(db: Session, group_by: str, start: str | None = None, end: str | None = None) -> dict:
+    period = models.TransactionDaily.day if group_by == "day" else func.substr(models.TransactionDaily.day, 1, 7)
+    query = select(
+        period.label("period"),
+        models.TransactionDaily.is_income,
+        func.sum(models.TransactionDaily.total),
+        func.sum(models.TransactionDaily.count),
+    ).group_by(period, models.TransactionDaily.is_income).order_by(period)
+    if start is not None:
+        query = query.where(models.TransactionDaily.day >= start)
+    if end is not None:
+        query = query.where(models.TransactionDaily.day <= end)
+
+    buckets = {}
+    for p, is_income, total, count in db.execute(query):
+        bucket = buckets.setdefault(p, {"period": p, "income": 0.0, "expenses": 0.0, "count": 0})
+        bucket["income" if is_income else "expenses"] += total
+        bucket["count"] += count
+    income = sum(b["income"] for b in buckets.values())
+    expenses = sum(b["expenses"] for b in buckets.values())
+    return {
+        "income": income,
+        "expenses": expenses,
+        "net": income - expenses,
+        "count": sum(b["count"] for b in buckets.values()),
+        "buckets": list(buckets.values()),
+    }
@@ -0,0 +1,63 @@
+"""Template load and render throughput for the day-6 rendering setup.
+
+    python bench_render.py --rows 10000 --renders 50
+"""
+import argparse
+import tempfile
+import time
+
+from jinja2 import Environment, FileSystemLoader
+
+from rendering import create_environment, precompile
+
+
+def per_second(fn, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return n / (time.perf_counter() - start)
+
+
+def items(rows):
+    return ({"id": i, "name": f"Item {i}", "price": i * 1.5} for i in range(rows))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--renders", type=int, default=50)
+    parser.add_argument("--loads", type=int, default=200)
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp()
+    precompile(create_environment(cache_dir=cache_dir))
+
+    # A cold worker: fresh Environment, with and without the on-disk bytecode cache
+    no_cache = per_second(lambda: Environment(loader=FileSystemLoader("templates"), extensions=["rendering.FragmentCacheExtension"]).get_template("report.html"), args.loads)
+    with_cache = per_second(lambda: create_environment(cache_dir=cache_dir).get_template("report.html"), args.loads)
+    print(f"cold template load, compile from source   {no_cache:>10,.0f} /s")
+    print(f"cold template load, bytecode cache        {with_cache:>10,.0f} /s")
+
+    env = create_environment(cache_dir=cache_dir)
+    template = env.get_template("report.html")
+    context = {"rows": args.rows}
+    print(f"render() full page, {args.rows:,} rows          {per_second(lambda: template.render(items=items(args.rows), **context), args.renders):>10,.1f} /s")
+
+    start = time.perf_counter()
+    next(template.generate(items=items(args.rows), **context))
+    print(f"generate() time to first chunk            {(time.perf_counter() - start) * 1000:>10.3f} ms")
+    start = time.perf_counter()
+    template.render(items=items(args.rows), **context)
+    print(f"render() time to first byte               {(time.perf_counter() - start) * 1000:>10.3f} ms")
+
+    summary = env.from_string('{% cache "sum", n %}{{ range(n) | sum }}{% endcache %}')
+    env.fragment_cache_ttl = 0
+    uncached = per_second(lambda: summary.render(n=args.rows * 10), args.renders)
+    env.fragment_cache_ttl = 60
+    cached = per_second(lambda: summary.render(n=args.rows * 10), args.renders)
+    print(f"expensive fragment, no fragment cache     {uncached:>10,.0f} /s")
+    print(f"expensive fragment, fragment cache        {cached:>10,.0f} /s")
+
+
+if __name__ == "__main__":
+    main()
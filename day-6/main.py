@@ -1,10 +1,29 @@
-from fastapi import FastAPI, Request
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import StreamingResponse
 from fastapi.templating import Jinja2Templates
+from rendering import create_environment, precompile
 
-app = FastAPI()
+env = create_environment("templates")
 
-templates = Jinja2Templates(directory="templates")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    count = precompile(env)
+    print(f"Precompiled {count} templates")
+    yield
+
+app = FastAPI(lifespan=lifespan)
+
+templates = Jinja2Templates(env=env)
 
 @app.get("/")
 async def home(request: Request):
-    return templates.TemplateResponse("home.html", {"request": request, "message": "Hello, FastAPI with Jinja2!"})
\ No newline at end of file
+    return templates.TemplateResponse(request, "home.html", {"message": "Hello, FastAPI with Jinja2!"})
+
+@app.get("/report")
+def report(request: Request, rows: int = Query(default=1000, ge=0, le=100_000)):
+    # generate() yields the page piece by piece, so the first bytes go out
+    # before the whole table has been rendered
+    template = env.get_template("report.html")
+    items = ({"id": i, "name": f"Item {i}", "price": i * 1.5} for i in range(rows))
+    return StreamingResponse(template.generate(request=request, rows=rows, items=items), media_type="text/html")
@@ -0,0 +1,76 @@
+import os
+import threading
+import time
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, nodes, select_autoescape
+from jinja2.ext import Extension
+
+KEY_TYPES = (str, int, float, bool)
+
+class FragmentCacheExtension(Extension):
+    """Cache the output of a block for a while.
+
+        {% cache "sidebar", user.id, page %}...{% endcache %}
+
+    The first argument names the fragment; any others become part of the key,
+    so different contexts get their own entry. Key values must be strings,
+    numbers, booleans or None: other objects usually repr with their memory
+    address and would miss every time, so they raise TypeError. Entries live for
+    `fragment_cache_ttl` seconds and the oldest are dropped past `fragment_cache_size`.
+    """
+
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache={}, fragment_cache_ttl=60, fragment_cache_size=1024)
+        self._lock = threading.Lock()
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        vary = []
+        while parser.stream.skip_if("comma"):
+            vary.append(parser.parse_expression())
+        args.append(nodes.List(vary))
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_cache", args), [], [], body).set_lineno(lineno)
+
+    def _cache(self, name, vary, caller):
+        env = self.environment
+        for value in (name, *vary):
+            if value is not None and not isinstance(value, KEY_TYPES):
+                raise TypeError(f"{{% cache %}} key values must be str, int, float, bool or None, not {type(value).__name__}")
+        # Types are part of the key so 1, 1.0 and True stay separate entries
+        key = (name, tuple((type(value), value) for value in vary))
+        now = time.monotonic()
+        entry = env.fragment_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        value = caller()
+        with self._lock:
+            cache = env.fragment_cache
+            cache.pop(key, None)
+            cache[key] = (now + env.fragment_cache_ttl, value)
+            while len(cache) > env.fragment_cache_size:
+                cache.pop(next(iter(cache)))
+        return value
+
+def create_environment(directory: str = "templates", cache_dir: str | None = None, fragment_cache_ttl: float = 60) -> Environment:
+    # Compiled templates are written to cache_dir so new workers skip compilation
+    cache_dir = cache_dir or os.getenv("JINJA_CACHE_DIR", ".jinja_cache")
+    os.makedirs(cache_dir, exist_ok=True)
+    env = Environment(
+        loader=FileSystemLoader(directory),
+        bytecode_cache=FileSystemBytecodeCache(cache_dir),
+        autoescape=select_autoescape(),
+        extensions=[FragmentCacheExtension],
+        auto_reload=os.getenv("JINJA_AUTO_RELOAD", "false").lower() == "true",
+    )
+    env.fragment_cache_ttl = fragment_cache_ttl
+    return env
+
+def precompile(env: Environment) -> int:
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    return len(names)
@@ -0,0 +1,82 @@
+"""Local cold-start harness for the Lambda handler, no AWS or network needed.
+
+Each run starts a fresh interpreter (a cold container), imports main with
+-X importtime, then invokes handler with synthetic API Gateway events.
+
+    python bench_cold_start.py --runs 10 --top 15
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+CHILD = r"""
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+def event(path):
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "localhost", "accept": "application/json"},
+        "requestContext": {
+            "http": {"method": "GET", "path": path, "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1", "userAgent": "bench"},
+            "stage": "$default",
+        },
+        "isBase64Encoded": False,
+    }
+
+class Context:
+    function_name = "bench"
+    aws_request_id = "bench"
+
+timings = {"import": imported - start}
+for path in ("/", "/openapi.json"):
+    t = time.perf_counter()
+    response = main.handler(event(path), Context())
+    assert response["statusCode"] == 200, response
+    timings[path] = time.perf_counter() - t
+print(json.dumps(timings))
+"""
+
+
+def parse_importtime(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        modules.append((int(cumulative_us), int(self_us), name.strip()))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    samples = []
+    for _ in range(args.runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD], capture_output=True, text=True, check=True
+        )
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"{args.runs} cold starts (median)")
+    for key in samples[0]:
+        label = "import main" if key == "import" else f"first GET {key}"
+        print(f"  {label:<24} {statistics.median(s[key] for s in samples) * 1000:8.1f} ms")
+
+    print("\nslowest imports (last run, cumulative)")
+    for cumulative, self_us, name in sorted(parse_importtime(proc.stderr), reverse=True)[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+
+if __name__ == "__main__":
+    main()
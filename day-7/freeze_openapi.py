@@ -0,0 +1,12 @@
+"""Write the app's OpenAPI schema to openapi.json for packaging with main.py."""
+import json
+import os
+
+import main
+
+if os.path.exists(main.OPENAPI_PATH):
+    os.remove(main.OPENAPI_PATH)
+main.app.openapi_schema = None
+with open(main.OPENAPI_PATH, "w") as f:
+    json.dump(main.app.openapi(), f)
+print(f"wrote {main.OPENAPI_PATH}")
@@ -1,10 +1,21 @@
-from fastapi import FastAPI, HTTPException, Depends, Request
+import json
+import os
+from fastapi import FastAPI, Request
 from mangum import Mangum
 
+# Written at package time by freeze_openapi.py so a cold container doesn't
+# rebuild the schema on the first /docs or /openapi.json request
+OPENAPI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openapi.json")
+
 app = FastAPI()
 
-handler = Mangum(app)
+# No startup/shutdown handlers, so skip running the lifespan on every invocation
+handler = Mangum(app, lifespan="off")
 
 @app.get("/")
 async def home(request: Request):
-    return {"message": "Hello, FastAPI on AWS Lambda!"}
\ No newline at end of file
+    return {"message": "Hello, FastAPI on AWS Lambda!"}
+
+if os.path.exists(OPENAPI_PATH):
+    with open(OPENAPI_PATH) as f:
+        app.openapi_schema = json.load(f)
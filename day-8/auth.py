@@ -5,7 +5,9 @@ from sqlalchemy.orm import Session
 from models import User
 from starlette import status
 from database import SessionLocal
-from passlib.context import CryptContext
+from hashing import HashQueueFull, password_hasher
+import user_cache as users
+from tokens import TokenVerifier, load_keys
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
@@ -18,10 +20,20 @@ router = APIRouter(
 
 SECRET_KEY = os.getenv("SECRET_KEY")  # Use a secure key in production
 ALGORITHM = os.getenv("ALGORITHM", "HS256")  # Default to HS256 if not set
+# RS*/ES* read JWT_PRIVATE_KEY / JWT_PUBLIC_KEY (or *_FILE) instead of SECRET_KEY
+SIGNING_KEY, VERIFYING_KEY = load_keys(SECRET_KEY, ALGORITHM)
+token_verifier = TokenVerifier(
+    VERIFYING_KEY,
+    ALGORITHM,
+    maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL", "300")),
+)
 
-bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto") # passlib context for hashing passwords
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token") # OAuth2 scheme for token retrieval
 
+# Usernames allowed to read the operational metrics endpoints (comma-separated)
+ADMIN_USERS = {name.strip() for name in os.getenv("ADMIN_USERS", "").split(",") if name.strip()}
+
 class CreateUserRequest(BaseModel):
     username: str
     password: str
@@ -39,9 +51,20 @@ def get_db():
 
 db_dependency = Annotated[Session, Depends(get_db)]
 
+async def run_hasher(call):
+    # bcrypt runs on password_hasher's pool; a full queue means back off, not wait
+    try:
+        return await call
+    except HashQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many password operations in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
+
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_user(user: CreateUserRequest, db: db_dependency):
-    hashed_password = bcrypt_context.hash(user.password)
+    hashed_password = await run_hasher(password_hasher.hash(user.password))
     user_model = User(username=user.username, hashed_password=hashed_password)
     db.add(user_model)
     db.commit()
@@ -51,7 +74,7 @@ async def create_user(user: CreateUserRequest, db: db_dependency):
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: Annotated[OAuth2PasswordRequestForm, Depends()], db: db_dependency):
     user = db.query(User).filter(User.username == form_data.username).first()
-    if not user or not bcrypt_context.verify(form_data.password, user.hashed_password):
+    if not user or not await run_hasher(password_hasher.verify(form_data.password, user.hashed_password)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -70,7 +93,9 @@ def create_access_token(username: str, user_id: int, expires_delta: timedelta |
     else:
         expire = datetime.utcnow() + timedelta(minutes=15)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    if SIGNING_KEY is None:
+        raise RuntimeError("No signing key configured")
+    encoded_jwt = jwt.encode(to_encode, SIGNING_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 def get_current_user(token: Annotated[str, Depends(oauth2_bearer)], db: db_dependency):
@@ -80,14 +105,40 @@ def get_current_user(token: Annotated[str, Depends(oauth2_bearer)], db: db_depen
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = token_verifier.decode(token)
         username: str = payload.get("sub")
         user_id: int = payload.get("id")
         if username is None or user_id is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    if users.USER_LOOKUP_MODE == "stateless":
+        return users.CurrentUser(id=user_id, username=username)
+    if users.USER_LOOKUP_MODE == "cache":
+        cached = users.user_cache.get(user_id)
+        if cached is not None:
+            return cached
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    current_user = users.CurrentUser(id=user.id, username=user.username, email=user.email)
+    if users.USER_LOOKUP_MODE == "cache":
+        users.user_cache.set(current_user, token_expires_at=payload.get("exp"))
+    return current_user
+
+def get_admin_user(user: Annotated[users.CurrentUser, Depends(get_current_user)]):
+    # Queue depth and rejection counts would let anyone time a login storm
+    # against the 503 backpressure, so the metrics are for admins only
+    if user.username not in ADMIN_USERS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user
+
+admin_dependency = Annotated[users.CurrentUser, Depends(get_admin_user)]
+
+@router.get("/hash-metrics")
+async def hash_metrics(admin: admin_dependency):
+    return password_hasher.metrics()
+
+@router.get("/cache-metrics")
+async def cache_metrics(admin: admin_dependency):
+    return {"mode": users.USER_LOOKUP_MODE, **users.user_cache.stats(), "tokens": token_verifier.stats()}
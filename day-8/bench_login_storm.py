@@ -0,0 +1,85 @@
+"""Latency of an unrelated endpoint while a burst of logins runs.
+
+Compares bcrypt on the event loop ("inline", the old behaviour) with the
+bounded thread pool. Runs in-process against a temporary SQLite database.
+
+    python bench_login_storm.py --logins 40
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.chdir(tempfile.mkdtemp())
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import httpx  # noqa: E402
+
+import hashing  # noqa: E402
+from main import app  # noqa: E402
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+async def storm(client, logins):
+    latencies = []
+    done = asyncio.Event()
+
+    async def pinger():
+        # Latency is measured from when the ping was due, so time spent waiting
+        # for a blocked event loop counts too
+        while not done.is_set():
+            due = time.perf_counter()
+            await asyncio.sleep(0.005)
+            await client.get("/ping")
+            latencies.append(time.perf_counter() - due - 0.005)
+
+    async def login():
+        response = await client.post("/auth/token", data={"username": "bench", "password": "bench-password"})
+        return response.status_code
+
+    pinger_task = asyncio.create_task(pinger())
+    await asyncio.sleep(0.05)
+    start = time.perf_counter()
+    statuses = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await pinger_task
+    return latencies, statuses, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/", json={"username": "bench", "password": "bench-password"})
+        for mode in ("inline", "thread"):
+            hashing.password_hasher.mode = mode
+            hashing.password_hasher.workers = args.workers
+            hashing.password_hasher.max_queue = args.logins
+            latencies, statuses, elapsed = await storm(client, args.logins)
+            latencies.sort()
+            print(
+                f"{mode:<7} {args.logins} logins in {elapsed:5.2f}s "
+                f"(ok {statuses.count(200)}, 503 {statuses.count(503)})   "
+                f"/ping p50 {statistics.median(latencies) * 1000:7.1f} ms  "
+                f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:7.1f} ms  "
+                f"max {latencies[-1] * 1000:7.1f} ms  ({len(latencies)} pings)"
+            )
+        print(hashing.password_hasher.metrics())
+    hashing.password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+"""JWT verification throughput on one core, with and without the decode cache.
+
+Generates throwaway keys for each algorithm, signs `--tokens` distinct tokens
+and verifies them round-robin, like a busy API seeing the same tokens again.
+
+    python bench_token_verify.py --tokens 1000 --verifications 20000
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk, jwt
+
+from tokens import TokenVerifier
+
+
+def private_pem(algorithm):
+    if algorithm.startswith("RS"):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+
+
+def per_second(fn, tokens, n):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(tokens[i % len(tokens)])
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--verifications", type=int, default=20_000)
+    args = parser.parse_args()
+
+    expire = datetime.utcnow() + timedelta(minutes=30)
+    print(f"{'algorithm':<10} {'jwt.decode':>14} {'preloaded key':>14} {'cached':>14}   (verifications/s, 1 core)")
+    for algorithm in ("HS256", "RS256", "ES256"):
+        signing_key = jwk.construct("bench-secret" if algorithm == "HS256" else private_pem(algorithm), algorithm)
+        verifying_key = signing_key if algorithm == "HS256" else signing_key.public_key()
+        verifying_pem = "bench-secret" if algorithm == "HS256" else verifying_key.to_pem()
+        tokens = [jwt.encode({"sub": f"user{i}", "id": i, "exp": expire}, signing_key, algorithm=algorithm) for i in range(args.tokens)]
+
+        # Old path: key material parsed on every call
+        plain = per_second(lambda t: jwt.decode(t, verifying_pem, algorithms=[algorithm]), tokens, args.verifications)
+        uncached = TokenVerifier(verifying_key, algorithm, maxsize=0)
+        preloaded = per_second(uncached.decode, tokens, args.verifications)
+        cached = TokenVerifier(verifying_key, algorithm, maxsize=args.tokens)
+        warm = per_second(cached.decode, tokens, args.verifications)
+        print(f"{algorithm:<10} {plain:>14,.0f} {preloaded:>14,.0f} {warm:>14,.0f}   hit ratio {cached.stats()['hit_ratio']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
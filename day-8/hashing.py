@@ -0,0 +1,106 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from passlib.context import CryptContext
+
+bcrypt_context = CryptContext(schemes=["bcrypt"], deprecated="auto") # passlib context for hashing passwords
+
+# Module-level so they can be sent to a process pool
+def _hash(password: str) -> str:
+    return bcrypt_context.hash(password)
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return bcrypt_context.verify(password, hashed_password)
+
+def _timed(fn, *args):
+    # Wall clock, so the start time is comparable across processes
+    return time.time(), fn(*args)
+
+class HashQueueFull(Exception):
+    pass
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop on a bounded pool.
+
+    At most `workers` hashes run at once and at most `max_queue` more may wait;
+    past that, calls raise HashQueueFull instead of piling up. `mode` is
+    "thread" (bcrypt releases the GIL), "process", or "inline", which hashes on
+    the event loop like a plain sync call and is only useful for comparison.
+    """
+
+    def __init__(self, mode: str = "thread", workers: int = 4, max_queue: int = 64):
+        if mode not in ("thread", "process", "inline"):
+            raise ValueError(f"Unknown hashing mode: {mode}")
+        self.mode = mode
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, fn, *args):
+        if self.mode == "inline":
+            return fn(*args)
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self._rejected += 1
+                raise HashQueueFull()
+            self._in_flight += 1
+        queued_at = time.time()
+        try:
+            started_at, result = await asyncio.get_running_loop().run_in_executor(self._get_executor(), _timed, fn, *args)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+        finished_at = time.time()
+        with self._lock:
+            self._completed += 1
+            self._wait_seconds += started_at - queued_at
+            self._run_seconds += finished_at - started_at
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(_verify, password, hashed_password)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            completed = self._completed or 1
+            return {
+                "mode": self.mode,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "queued": max(0, self._in_flight - self.workers),
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_seconds": self._wait_seconds / completed,
+                "avg_run_seconds": self._run_seconds / completed,
+            }
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+password_hasher = PasswordHasher(
+    mode=os.getenv("PASSWORD_HASH_MODE", "thread"),
+    workers=int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2))),
+    max_queue=int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "64")),
+)
@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 load_dotenv()
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Depends
 from typing import Annotated
 from database import SessionLocal, engine
@@ -7,8 +8,14 @@ import models
 from sqlalchemy.orm import Session
 import auth
 from auth import get_current_user
+from hashing import password_hasher
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    password_hasher.shutdown()
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(auth.router)
 models.Base.metadata.create_all(bind=engine)
 
@@ -0,0 +1,27 @@
+import user_cache
+from user_cache import CurrentUser, UserCache
+
+def test_cached_user_expires_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(user_cache.time, "time", lambda: now[0])
+    cache = UserCache(ttl=60)
+    cache.set(CurrentUser(id=1, username="alice"))
+    now[0] += 59
+    assert cache.get(1).username == "alice"
+    now[0] += 1
+    assert cache.get(1) is None
+    assert cache.stats()["size"] == 0
+
+def test_cached_user_expires_with_its_token(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(user_cache.time, "time", lambda: now[0])
+    cache = UserCache(ttl=300)
+    cache.set(CurrentUser(id=1, username="alice"), token_expires_at=1010)
+    now[0] += 10
+    assert cache.get(1) is None
+
+def test_invalidate_drops_user():
+    cache = UserCache()
+    cache.set(CurrentUser(id=1, username="alice"))
+    cache.invalidate(1)
+    assert cache.get(1) is None
@@ -0,0 +1,97 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from jose import JWTError, jwk, jwt
+
+# python-jose has no EdDSA; ES256 is the compact-signature option it supports
+ASYMMETRIC_ALGORITHMS = ("RS256", "RS384", "RS512", "ES256", "ES384", "ES512")
+
+def read_key(name: str) -> str | None:
+    # PEM text from the `name` env var, or from the file named by `name`_FILE
+    path = os.getenv(f"{name}_FILE")
+    if path:
+        with open(path) as f:
+            return f.read()
+    return os.getenv(name)
+
+def load_keys(secret_key: str | None, algorithm: str):
+    """Build the (signing_key, verifying_key) pair once, at startup.
+
+    HS* algorithms use the shared secret for both. RS*/ES* sign with
+    JWT_PRIVATE_KEY and verify with JWT_PUBLIC_KEY (derived from the private
+    key when only that is set), so a node holding just the public key can
+    verify tokens but not mint them. Missing keys come back as None.
+    """
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        key = jwk.construct(secret_key, algorithm) if secret_key else None
+        return key, key
+    private_pem = read_key("JWT_PRIVATE_KEY")
+    public_pem = read_key("JWT_PUBLIC_KEY")
+    signing_key = jwk.construct(private_pem, algorithm) if private_pem else None
+    if public_pem:
+        verifying_key = jwk.construct(public_pem, algorithm)
+    else:
+        verifying_key = signing_key.public_key() if signing_key else None
+    return signing_key, verifying_key
+
+class TokenVerifier:
+    """Verifies JWTs and caches the claims of tokens that passed.
+
+    Entries are keyed by the SHA-256 digest of the token, so the cache never
+    holds bearer tokens, and expire at the token's `exp` or after `ttl`
+    seconds, whichever is first. Failed tokens are never cached. A `maxsize`
+    of 0 turns the cache off.
+    """
+
+    def __init__(self, key, algorithm: str = "HS256", maxsize: int = 10000, ttl: float = 300):
+        self.key = key
+        self.algorithm = algorithm
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._claims: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def decode(self, token: str) -> dict:
+        if self.key is None:
+            raise JWTError("No verification key configured")
+        digest = hashlib.sha256(token.encode()).digest()
+        now = time.time()
+        with self._lock:
+            entry = self._claims.get(digest)
+            if entry is not None and entry[0] <= now:
+                del self._claims[digest]
+                entry = None
+            if entry is not None:
+                self._claims.move_to_end(digest)
+                self.hits += 1
+                return dict(entry[1])
+            self.misses += 1
+        claims = jwt.decode(token, self.key, algorithms=[self.algorithm])
+        if self.maxsize > 0:
+            expires_at = now + self.ttl
+            if isinstance(claims.get("exp"), (int, float)):
+                expires_at = min(expires_at, claims["exp"])
+            with self._lock:
+                self._claims[digest] = (expires_at, claims)
+                self._claims.move_to_end(digest)
+                while len(self._claims) > self.maxsize:
+                    self._claims.popitem(last=False)
+        return dict(claims)
+
+    def invalidate(self):
+        with self._lock:
+            self._claims.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "algorithm": self.algorithm,
+            "size": len(self._claims),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,83 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable
+from pydantic import BaseModel
+
+class CurrentUser(BaseModel):
+    id: int
+    username: str
+    email: str | None = None
+
+class UserCache:
+    """TTL + LRU cache of authenticated users keyed by user id.
+
+    An entry never outlives the token it was cached for, so a user is looked up
+    again at least once per token lifetime. Nothing in this app changes or
+    deletes users yet, so until such a route calls invalidate() a cached user
+    can be up to `ttl` seconds stale. `on_lookup(hit, stats)` is called after
+    every lookup and can feed a metrics system.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300, on_lookup: Callable[[bool, dict], None] | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_lookup = on_lookup
+        self._users: OrderedDict[int, tuple[float, CurrentUser]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> CurrentUser | None:
+        now = time.time()
+        with self._lock:
+            entry = self._users.get(user_id)
+            if entry is not None and entry[0] <= now:
+                del self._users[user_id]
+                entry = None
+            if entry is not None:
+                self._users.move_to_end(user_id)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if self.on_lookup is not None:
+            self.on_lookup(entry is not None, self.stats())
+        return entry[1] if entry is not None else None
+
+    def set(self, user: CurrentUser, token_expires_at: float | None = None):
+        expires_at = time.time() + self.ttl
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._users[user.id] = (expires_at, user)
+            self._users.move_to_end(user.id)
+            while len(self._users) > self.maxsize:
+                self._users.popitem(last=False)
+
+    def invalidate(self, user_id: int | None = None):
+        with self._lock:
+            if user_id is None:
+                self._users.clear()
+            else:
+                self._users.pop(user_id, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+# "cache" looks users up once per TTL, "stateless" trusts the signed token
+# claims and never reads the database, "db" is a lookup on every request
+USER_LOOKUP_MODE = os.getenv("USER_LOOKUP_MODE", "cache")
+if USER_LOOKUP_MODE not in ("cache", "stateless", "db"):
+    raise RuntimeError(f"Unknown USER_LOOKUP_MODE: {USER_LOOKUP_MODE}")
+
+user_cache = UserCache(
+    maxsize=int(os.getenv("USER_CACHE_SIZE", "10000")),
+    ttl=float(os.getenv("USER_CACHE_TTL", "300")),
+)
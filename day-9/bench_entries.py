@@ -0,0 +1,98 @@
+"""Latency and throughput of GET /entries per caching path, in-process.
+
+Uses fakeredis unless --redis-url points at a real server (fakeredis has no
+network round-trip, so the Redis paths look better than they would in
+production). The upstream is an httpx MockTransport returning --artworks items.
+
+    python bench_entries.py --requests 2000 --concurrency 20
+    python bench_entries.py --redis-url redis://localhost:6379/0
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import fakeredis
+import httpx
+
+from cache import LocalCache, RedisCache, TwoTierCache, create_redis
+from upstream import UpstreamClient
+import main
+from main import app
+
+
+@app.get("/bench/json-roundtrip")
+async def json_roundtrip():
+    # The original read_item hit path: fetch the string, decode, let FastAPI re-encode
+    value = await app.state.redis.get("bench:list")
+    return json.loads(value)
+
+
+@app.get("/bench/redis-only")
+async def redis_only():
+    body = await app.state.cache.l2.get_or_fetch("list", main.fetch_entries)
+    return main.Response(content=body, media_type="application/json")
+
+
+def upstream(artworks):
+    payload = {
+        "data": [{"id": i, "title": f"Cat study {i}", "artist_display": "Unknown", "thumbnail": {"alt_text": "A cat " * 20}} for i in range(artworks)]
+    }
+
+    async def handler(request):
+        return httpx.Response(200, json=payload)
+
+    return UpstreamClient(transport=httpx.MockTransport(handler))
+
+
+async def measure(client, path, requests, concurrency, headers=None):
+    latencies = []
+    queue = iter(range(requests))
+
+    async def worker():
+        for _ in queue:
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code in (200, 304), response.status_code
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1], requests / elapsed
+
+
+async def run():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--artworks", type=int, default=500)
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    app.state.redis = create_redis(args.redis_url) if args.redis_url else fakeredis.FakeAsyncRedis()
+    app.state.upstream = upstream(args.artworks)
+    app.state.cache = TwoTierCache(RedisCache(app.state.redis), LocalCache(ttl=60))
+    body = await app.state.cache.l2.get_or_fetch("list", main.fetch_entries)
+    await app.state.redis.set("bench:list", body)
+    print(f"payload {len(body) / 1024:,.0f} KiB, {args.requests} requests, concurrency {args.concurrency}")
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+        etag = (await client.get("/entries")).headers["etag"]
+        paths = [
+            ("redis + json round-trip", "/bench/json-roundtrip", None),
+            ("redis bytes (L2 only)", "/bench/redis-only", None),
+            ("L1 bytes + ETag", "/entries", None),
+            ("L1, If-None-Match -> 304", "/entries", {"If-None-Match": etag}),
+        ]
+        for label, path, headers in paths:
+            p50, p99, rps = await measure(client, path, args.requests, args.concurrency, headers)
+            print(f"  {label:<26} p50 {p50 * 1000:7.2f} ms   p99 {p99 * 1000:7.2f} ms   {rps:8,.0f} req/s")
+    await app.state.upstream.aclose()
+    await app.state.redis.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
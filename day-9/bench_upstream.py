@@ -0,0 +1,127 @@
+"""Upstream fan-out throughput per client setup, against a local stand-in server.
+
+The stand-in is a minimal keep-alive HTTP/1.1 server on 127.0.0.1, in its own
+process, that waits --latency ms per request and fails --fail-rate of them with
+503, so pooling, keepalive and retries behave as they would against a real
+upstream. Connection counts are new TCP connections the stand-in accepted.
+
+    python bench_upstream.py --fanout 200 --batches 10 --latency 20 --fail-rate 0.02
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import statistics
+import time
+
+import httpx
+
+from upstream import CircuitBreaker, UpstreamClient
+
+
+def run_upstream(port, latency, fail_rate, connections):
+    body = b'{"data": []}' * 100
+
+    async def serve(reader, writer):
+        with connections.get_lock():
+            connections.value += 1
+        try:
+            while True:
+                await reader.readuntil(b"\r\n\r\n")
+                await asyncio.sleep(latency)
+                status = b"503 Service Unavailable" if random.random() < fail_rate else b"200 OK"
+                writer.write(b"HTTP/1.1 %b\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%b" % (status, len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def main():
+        server = await asyncio.start_server(serve, "127.0.0.1", port.value, backlog=4096)
+        port.value = server.sockets[0].getsockname()[1]
+        await server.serve_forever()
+
+    asyncio.run(main())
+
+
+def start_upstream(latency, fail_rate):
+    port = multiprocessing.Value("i", 0)
+    connections = multiprocessing.Value("i", 0)
+    process = multiprocessing.Process(target=run_upstream, args=(port, latency, fail_rate, connections), daemon=True)
+    process.start()
+    while port.value == 0:
+        time.sleep(0.01)
+    return process, f"http://127.0.0.1:{port.value}/artworks", connections
+
+
+async def fan_out(get, url, fanout, batches):
+    latencies, errors = [], 0
+
+    async def one():
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            response = await get(url)
+            if response.status_code != 200:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(batches):
+        await asyncio.gather(*(one() for _ in range(fanout)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return fanout * batches / elapsed, statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1], errors
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fanout", type=int, default=200)
+    parser.add_argument("--batches", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=20, help="upstream latency in ms")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--max-keepalive", type=int, default=20)
+    args = parser.parse_args()
+
+    process, url, connections = start_upstream(args.latency / 1000, args.fail_rate)
+
+    async def client_per_request(url):
+        async with httpx.AsyncClient() as client:
+            return await client.get(url)
+
+    shared_default = httpx.AsyncClient()
+    tuned = UpstreamClient(
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_keepalive,
+        retries=2,
+        backoff=0.02,
+        breaker=CircuitBreaker(failure_threshold=args.fanout),
+    )
+    setups = [
+        ("new client per request", client_per_request),
+        ("shared AsyncClient() defaults", shared_default.get),
+        ("UpstreamClient", tuned.get),
+    ]
+    print(
+        f"fan-out {args.fanout} x {args.batches} batches, upstream {args.latency:.0f} ms, fail rate {args.fail_rate:.0%}, "
+        f"UpstreamClient limits {args.max_connections}/{args.max_keepalive} keepalive"
+    )
+    for label, get in setups:
+        connections.value = 0
+        rps, p50, p99, errors = await fan_out(get, url, args.fanout, args.batches)
+        print(
+            f"  {label:<30} {rps:8,.0f} req/s   p50 {p50 * 1000:7.1f} ms   p99 {p99 * 1000:7.1f} ms   "
+            f"connections {connections.value:>5}   errors {errors}"
+        )
+    print(f"  UpstreamClient stats: {tuned.stats()}")
+    await shared_default.aclose()
+    await tuned.aclose()
+    process.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
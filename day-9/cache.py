@@ -0,0 +1,255 @@
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, NamedTuple
+from redis.asyncio import ConnectionPool, Redis
+from redis.exceptions import RedisError
+
+def create_redis(url: str | None = None, max_connections: int | None = None) -> Redis:
+    # One pool per process, shared by every request. from_pool hands the pool
+    # to the client, so aclose() disconnects it too; Redis(connection_pool=...)
+    # would leave every pooled socket open
+    pool = ConnectionPool.from_url(
+        url or os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        max_connections=max_connections or int(os.getenv("REDIS_MAX_CONNECTIONS", "50")),
+    )
+    return Redis.from_pool(pool)
+
+class RedisCache:
+    """Async read-through cache of byte values in Redis.
+
+    A value is fresh for `ttl` seconds, then served stale for up to
+    `stale_ttl` more while one background refresh runs. Misses are
+    single-flight: concurrent callers in this process share one fetch, and a
+    short Redis lock keeps other workers from fetching the same key at the same
+    time (they wait for the value, and fetch themselves only if the lock
+    holder takes longer than `lock_timeout`). If Redis is unreachable the
+    value is fetched without caching or locking and counted in `errors`, so
+    an outage slows requests down instead of failing them.
+    """
+
+    def __init__(self, redis: Redis, ttl: float = 300, stale_ttl: float = 3600, lock_timeout: float = 10, prefix: str = "cache:"):
+        self.redis = redis
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.prefix = prefix
+        self._in_flight: dict[str, asyncio.Future] = {}
+        self._refreshes: set[asyncio.Task] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+        self.errors = 0
+
+    # Stored as b"<fresh until>|<value>" so one GET returns both
+    async def _read(self, key: str) -> tuple[float, bytes] | None:
+        raw = await self.redis.get(self.prefix + key)
+        if raw is None:
+            return None
+        fresh_until, _, value = raw.partition(b"|")
+        return float(fresh_until), value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None, stale_ttl: float | None = None):
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        fresh_until = time.time() + ttl
+        await self.redis.set(self.prefix + key, b"%f|%b" % (fresh_until, value), px=int((ttl + stale_ttl) * 1000))
+
+    async def delete(self, key: str):
+        await self.redis.delete(self.prefix + key)
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[bytes]], ttl: float | None = None, stale_ttl: float | None = None) -> bytes:
+        try:
+            cached = await self._read(key)
+        except RedisError:
+            self.errors += 1
+            cached = None
+        if cached is not None:
+            fresh_until, value = cached
+            if fresh_until > time.time():
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if key not in self._in_flight:
+                    task = asyncio.create_task(self._fetch(key, fetch, ttl, stale_ttl))
+                    self._refreshes.add(task)
+                    task.add_done_callback(self._refresh_done)
+            return value
+        self.misses += 1
+        return await self._fetch(key, fetch, ttl, stale_ttl)
+
+    def _refresh_done(self, task: asyncio.Task):
+        self._refreshes.discard(task)
+        if not task.cancelled():
+            # A failed refresh keeps serving the stale value; the next stale hit retries
+            task.exception()
+
+    async def _fetch(self, key: str, fetch, ttl, stale_ttl) -> bytes:
+        if key in self._in_flight:
+            return await asyncio.shield(self._in_flight[key])
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await self._fetch_once(key, fetch, ttl, stale_ttl)
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved in case nobody else was waiting
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._in_flight[key]
+
+    async def _fetch_once(self, key: str, fetch, ttl, stale_ttl) -> bytes:
+        lock_key = f"{self.prefix}lock:{key}"
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + self.lock_timeout
+        locked = False
+        try:
+            while not (locked := bool(await self.redis.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000)))):
+                # Another worker is fetching; take its value when it lands
+                await asyncio.sleep(0.05)
+                cached = await self._read(key)
+                if cached is not None and cached[0] > time.time():
+                    return cached[1]
+                if time.monotonic() >= deadline:
+                    break
+        except RedisError:
+            # No cross-worker lock without Redis; callers in this process still share one fetch
+            self.errors += 1
+        try:
+            self.fetches += 1
+            value = await fetch()
+            try:
+                await self.set(key, value, ttl, stale_ttl)
+            except RedisError:
+                self.errors += 1
+            return value
+        finally:
+            # Release only our own lock, not one taken over after a timeout
+            if locked:
+                try:
+                    if await self.redis.get(lock_key) == token.encode():
+                        await self.redis.delete(lock_key)
+                except RedisError:
+                    self.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "fetches": self.fetches,
+            "errors": self.errors,
+            "in_flight": len(self._in_flight),
+        }
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+class LocalCache:
+    """In-process LRU of encoded response bodies, bounded by total bytes.
+
+    Entries live for `ttl` seconds. Nothing is awaited, so a hit costs one
+    dict lookup and no serialization.
+    """
+
+    def __init__(self, ttl: float = 5, max_bytes: int = 64 * 1024 * 1024):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[float, CachedResponse]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> CachedResponse | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            self.delete(key)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key: str, body: bytes) -> CachedResponse:
+        response = CachedResponse(body, '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest())
+        if len(body) > self.max_bytes:
+            return response
+        self.delete(key)
+        self._entries[key] = (time.monotonic() + self.ttl, response)
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            self.delete(next(iter(self._entries)))
+        return response
+
+    def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1].body)
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+class TwoTierCache:
+    """LocalCache (L1) in front of a RedisCache (L2).
+
+    L1 misses fall through to the L2 read-through path, so stampede
+    protection and stale-while-revalidate still apply. invalidate() drops the
+    key everywhere and publishes it on `channel`; every worker running
+    listen() drops its L1 copy when the message arrives.
+    """
+
+    def __init__(self, l2: RedisCache, l1: LocalCache | None = None, channel: str = "cache:invalidate"):
+        self.l2 = l2
+        self.l1 = l1 or LocalCache()
+        self.channel = channel
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[bytes]], ttl: float | None = None, stale_ttl: float | None = None) -> CachedResponse:
+        cached = self.l1.get(key)
+        if cached is not None:
+            return cached
+        body = await self.l2.get_or_fetch(key, fetch, ttl, stale_ttl)
+        return self.l1.set(key, body)
+
+    async def invalidate(self, key: str):
+        self.l1.delete(key)
+        await self.l2.delete(key)
+        await self.l2.redis.publish(self.channel, key)
+
+    async def listen(self, retry_delay: float = 1):
+        # Run as a background task for the life of the worker
+        while True:
+            pubsub = self.l2.redis.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Messages may have been missed while unsubscribed
+                self.l1.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.l1.delete(message["data"].decode())
+            except RedisError:
+                await asyncio.sleep(retry_delay)
+            finally:
+                await pubsub.aclose()
+
+    def stats(self) -> dict:
+        return {"l1": self.l1.stats(), "l2": self.l2.stats()}
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
@@ -1,33 +1,78 @@
-from fastapi import FastAPI
-from redis import Redis
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
+from cache import LocalCache, RedisCache, TwoTierCache, create_redis, etag_matches
+from upstream import CircuitOpen, upstream_from_env
+import asyncio
+import contextlib
 import httpx
-import json
+import os
+import secrets
 
-app = FastAPI()
-redis_client = Redis(host='localhost', port=6379)
+UPSTREAM_URL = os.getenv("UPSTREAM_URL", "https://api.artic.edu/api/v1/artworks/search?q=cats")
+# Bearer token for admin routes; unset disables them
+CACHE_ADMIN_TOKEN = os.getenv("CACHE_ADMIN_TOKEN")
 
-@app.on_event("startup")
-async def startup_event():
-    # Initialize Redis connection or any other startup tasks
-    app.state.redis = Redis(host='localhost', port=6379)
-    app.state.http_client = httpx.AsyncClient()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One Redis pool and one upstream client per worker, closed on shutdown
+    app.state.redis = create_redis()
+    app.state.cache = TwoTierCache(
+        RedisCache(
+            app.state.redis,
+            ttl=float(os.getenv("CACHE_TTL", "300")),
+            stale_ttl=float(os.getenv("CACHE_STALE_TTL", "3600")),
+        ),
+        LocalCache(
+            ttl=float(os.getenv("L1_CACHE_TTL", "5")),
+            max_bytes=int(os.getenv("L1_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+        ),
+    )
+    # Drops this worker's L1 entries when any worker invalidates a key
+    invalidation_listener = asyncio.create_task(app.state.cache.listen())
+    app.state.upstream = upstream_from_env()
     print("Application startup: Redis and HTTP client initialized.")
+    try:
+        yield
+    finally:
+        invalidation_listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError, Exception):
+            await invalidation_listener
+        await app.state.upstream.aclose()
+        await app.state.redis.aclose()
+        print("Application shutdown: Resources cleaned up.")
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    # Clean up resources on shutdown
-    app.state.redis.close()
-    print("Application shutdown: Resources cleaned up.")
+app = FastAPI(lifespan=lifespan)
+
+async def fetch_entries() -> bytes:
+    response = await app.state.upstream.get(UPSTREAM_URL)
+    response.raise_for_status()
+    return response.content
 
 @app.get("/entries")
-async def read_item():
-    value = app.state.redis.get("list")
-    if value is None:
-        response = await app.state.http_client.get("https://api.artic.edu/api/v1/artworks/search?q=cats")
-        data_str = json.dumps(response.json())
-        app.state.redis.set("list", data_str)
-        return response.json()
-    return json.loads(value)
+async def read_item(request: Request):
+    try:
+        cached = await app.state.cache.get_or_fetch("list", fetch_entries)
+    except CircuitOpen:
+        raise HTTPException(status_code=503, detail="Upstream unavailable", headers={"Retry-After": "5"})
+    except httpx.HTTPError:
+        raise HTTPException(status_code=502, detail="Upstream request failed")
+    headers = {"ETag": cached.etag}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    # Cached bytes are the upstream JSON as-is, so skip decoding and re-encoding
+    return Response(content=cached.body, media_type="application/json", headers=headers)
 
+def require_admin(authorization: str | None = Header(default=None)):
+    # Clearing the cache turns every later request into an upstream fetch,
+    # so it must not be open to anyone
+    expected = f"Bearer {CACHE_ADMIN_TOKEN}" if CACHE_ADMIN_TOKEN else None
+    if expected is None or not secrets.compare_digest((authorization or "").encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
 
+@app.delete("/entries/cache", status_code=204, dependencies=[Depends(require_admin)])
+async def invalidate_entries():
+    await app.state.cache.invalidate("list")
 
+@app.get("/cache-metrics")
+async def cache_metrics():
+    return {**app.state.cache.stats(), "upstream": app.state.upstream.stats()}
@@ -0,0 +1,151 @@
+import asyncio
+import json
+import fakeredis
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from cache import LocalCache, RedisCache, TwoTierCache, create_redis
+from main import app
+from upstream import CircuitBreaker, CircuitOpen, UpstreamClient
+
+def mock_transport(calls, status_code=200, delay=0.05):
+    async def handler(request):
+        calls.append(request.url)
+        await asyncio.sleep(delay)
+        code = status_code(len(calls)) if callable(status_code) else status_code
+        return httpx.Response(code, json={"data": [{"title": "Cat", "n": len(calls)}]})
+    return httpx.MockTransport(handler)
+
+def mock_upstream(calls, status_code=200, delay=0.05):
+    return httpx.AsyncClient(transport=mock_transport(calls, status_code, delay))
+
+def test_concurrent_misses_fetch_once():
+    async def run():
+        calls = []
+        cache = RedisCache(fakeredis.FakeAsyncRedis(), ttl=60)
+        async with mock_upstream(calls) as client:
+            async def fetch():
+                return (await client.get("http://upstream/")).content
+            values = await asyncio.gather(*(cache.get_or_fetch("list", fetch) for _ in range(50)))
+        return calls, values, cache
+    calls, values, cache = asyncio.run(run())
+    assert len(calls) == 1
+    assert len(set(values)) == 1
+    assert cache.stats()["fetches"] == 1
+
+def test_value_expires():
+    async def run():
+        redis = fakeredis.FakeAsyncRedis()
+        cache = RedisCache(redis, ttl=10, stale_ttl=20)
+        await cache.set("list", b"[]")
+        return await redis.pttl("cache:list")
+    assert 29000 < asyncio.run(run()) <= 30000
+
+def test_stale_value_served_while_refreshing():
+    async def run():
+        calls = []
+        cache = RedisCache(fakeredis.FakeAsyncRedis(), ttl=0, stale_ttl=60)
+        await cache.set("list", b'{"old": true}')
+        async with mock_upstream(calls) as client:
+            async def fetch():
+                return (await client.get("http://upstream/")).content
+            first = await cache.get_or_fetch("list", fetch, ttl=60)
+            await asyncio.gather(*cache._refreshes)
+            second = await cache.get_or_fetch("list", fetch, ttl=60)
+        return calls, first, second
+    calls, first, second = asyncio.run(run())
+    assert first == b'{"old": true}'
+    assert json.loads(second)["data"][0]["title"] == "Cat"
+    assert len(calls) == 1
+
+def test_entries_endpoint():
+    calls = []
+    with TestClient(app) as client:
+        app.state.cache = TwoTierCache(RedisCache(fakeredis.FakeAsyncRedis()))
+        app.state.upstream = UpstreamClient(transport=mock_transport(calls, delay=0))
+        response = client.get("/entries")
+        assert response.json()["data"][0]["title"] == "Cat"
+        etag = response.headers["etag"]
+        assert client.get("/entries").headers["etag"] == etag
+        not_modified = client.get("/entries", headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert len(calls) == 1
+        assert app.state.cache.stats()["l1"]["hits"] == 2
+
+def test_entries_upstream_error():
+    with TestClient(app) as client:
+        app.state.cache = TwoTierCache(RedisCache(fakeredis.FakeAsyncRedis()))
+        app.state.upstream = UpstreamClient(transport=mock_transport([], status_code=500, delay=0))
+        assert client.get("/entries").status_code == 502
+
+def test_entries_served_when_redis_is_down():
+    calls = []
+    server = fakeredis.FakeServer()
+    server.connected = False
+    with TestClient(app) as client:
+        app.state.cache = TwoTierCache(RedisCache(fakeredis.FakeAsyncRedis(server=server)), LocalCache(ttl=0))
+        app.state.upstream = UpstreamClient(transport=mock_transport(calls, delay=0))
+        assert [client.get("/entries").status_code for _ in range(2)] == [200, 200]
+        assert len(calls) == 2
+        assert app.state.cache.stats()["l2"]["errors"] >= 2
+
+def test_upstream_retries_with_backoff():
+    calls = []
+    # 503 twice, then 200
+    client = UpstreamClient(retries=2, backoff=0, transport=mock_transport(calls, lambda n: 503 if n < 3 else 200, delay=0))
+    assert asyncio.run(client.get("http://upstream/")).status_code == 200
+    assert client.stats()["retried"] == 2
+
+def test_circuit_opens_after_failures():
+    client = UpstreamClient(retries=0, breaker=CircuitBreaker(failure_threshold=2, reset_timeout=60), transport=mock_transport([], 503, delay=0))
+    assert [asyncio.run(client.get("http://upstream/")).status_code for _ in range(2)] == [503, 503]
+    with pytest.raises(CircuitOpen):
+        asyncio.run(client.get("http://upstream/"))
+    assert client.stats()["circuit"] == "open"
+
+def test_entries_circuit_open():
+    with TestClient(app) as client:
+        app.state.cache = TwoTierCache(RedisCache(fakeredis.FakeAsyncRedis()))
+        app.state.upstream = UpstreamClient(retries=0, breaker=CircuitBreaker(failure_threshold=1), transport=mock_transport([], status_code=503, delay=0))
+        assert client.get("/entries").status_code == 502
+        response = client.get("/entries")
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "5"
+
+def test_cache_clear_requires_admin_token(monkeypatch):
+    import main
+    monkeypatch.setattr(main, "CACHE_ADMIN_TOKEN", "s3cret")
+    with TestClient(app) as client:
+        app.state.cache = TwoTierCache(RedisCache(fakeredis.FakeAsyncRedis()))
+        assert client.delete("/entries/cache").status_code == 403
+        assert client.delete("/entries/cache", headers={"Authorization": "Bearer wrong"}).status_code == 403
+        assert client.delete("/entries/cache", headers={"Authorization": "Bearer s3cret"}).status_code == 204
+
+def test_invalidation_reaches_other_workers():
+    async def run():
+        server = fakeredis.FakeServer()
+        workers = [TwoTierCache(RedisCache(fakeredis.FakeAsyncRedis(server=server)), LocalCache(ttl=60)) for _ in range(2)]
+        listeners = [asyncio.create_task(worker.listen()) for worker in workers]
+        await asyncio.sleep(0.05)
+        async def fetch():
+            return b"[1]"
+        for worker in workers:
+            await worker.get_or_fetch("list", fetch)
+        await workers[0].invalidate("list")
+        await asyncio.sleep(0.05)
+        for listener in listeners:
+            listener.cancel()
+        return [worker.l1.get("list") for worker in workers], await workers[1].l2.redis.get("cache:list")
+    l1_entries, l2_value = asyncio.run(run())
+    assert l1_entries == [None, None]
+    assert l2_value is None
+
+def test_closing_client_closes_pool(monkeypatch):
+    client = create_redis("redis://localhost:6379/0")
+    closed = []
+    async def disconnect(*args, **kwargs):
+        closed.append(True)
+    monkeypatch.setattr(client.connection_pool, "disconnect", disconnect)
+    asyncio.run(client.aclose())
+    assert closed
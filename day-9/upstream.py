@@ -0,0 +1,148 @@
+import asyncio
+import importlib.util
+import os
+import random
+import time
+import httpx
+
+# Only idempotent GETs go through here, so these are safe to retry
+RETRY_STATUSES = (502, 503, 504)
+
+class CircuitOpen(Exception):
+    pass
+
+class CircuitBreaker:
+    """Opens after `failure_threshold` consecutive failures.
+
+    While open, calls fail fast with CircuitOpen for `reset_timeout` seconds;
+    after that a single trial call is let through (half-open) and its result
+    closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_started: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def before_call(self):
+        state = self.state
+        if state == "open":
+            raise CircuitOpen()
+        if state == "half-open":
+            # One trial at a time; a trial that never reported back (cancelled)
+            # stops blocking others after reset_timeout
+            now = time.monotonic()
+            if self._trial_started is not None and now - self._trial_started < self.reset_timeout:
+                raise CircuitOpen()
+            self._trial_started = now
+
+    def record(self, ok: bool):
+        self._trial_started = None
+        if ok:
+            self.failures = 0
+            self.opened_at = None
+            return
+        self.failures += 1
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+class UpstreamClient:
+    """Shared httpx.AsyncClient with explicit pool limits, timeouts, retries and a circuit breaker.
+
+    Create one per process (in the lifespan handler) and close it on shutdown.
+    get() retries transport errors and 502/503/504 up to `retries` times with
+    full-jitter exponential backoff; every failed attempt counts towards the
+    breaker. Any other response is returned for the caller to check.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30,
+        http2: bool = False,
+        connect_timeout: float = 3,
+        read_timeout: float = 10,
+        pool_timeout: float = 5,
+        retries: int = 2,
+        backoff: float = 0.1,
+        breaker: CircuitBreaker | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            raise RuntimeError("HTTP/2 needs the h2 package: pip install 'httpx[http2]'")
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = breaker or CircuitBreaker()
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=pool_timeout),
+            http2=http2,
+            transport=transport,
+        )
+        self.requests = 0
+        self.retried = 0
+        self.rejected = 0
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        for attempt in range(self.retries + 1):
+            try:
+                self.breaker.before_call()
+            except CircuitOpen:
+                self.rejected += 1
+                raise
+            self.requests += 1
+            try:
+                response = await self.client.get(url, **kwargs)
+            except httpx.TransportError:
+                self.breaker.record(ok=False)
+                if attempt == self.retries:
+                    raise
+            else:
+                self.breaker.record(ok=response.status_code < 500)
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                await response.aclose()
+            self.retried += 1
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retried": self.retried,
+            "rejected": self.rejected,
+            "circuit": self.breaker.state,
+        }
+
+def upstream_from_env(transport: httpx.AsyncBaseTransport | None = None) -> UpstreamClient:
+    return UpstreamClient(
+        max_connections=int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100")),
+        max_keepalive_connections=int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30")),
+        http2=os.getenv("UPSTREAM_HTTP2", "0") == "1",
+        connect_timeout=float(os.getenv("UPSTREAM_CONNECT_TIMEOUT", "3")),
+        read_timeout=float(os.getenv("UPSTREAM_READ_TIMEOUT", "10")),
+        retries=int(os.getenv("UPSTREAM_RETRIES", "2")),
+        breaker=CircuitBreaker(
+            failure_threshold=int(os.getenv("UPSTREAM_BREAKER_THRESHOLD", "5")),
+            reset_timeout=float(os.getenv("UPSTREAM_BREAKER_RESET", "30")),
+        ),
+        transport=transport,
+    )